@@ -12,8 +12,12 @@ This script:
 """
 
 import argparse
+import hashlib
+import importlib.util
 import json
+import os
 import platform
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -52,6 +56,23 @@ def print_header(message: str) -> None:
     """Print header message."""
     print(f"\n{Colors.HEADER}{Colors.BOLD}{message}{Colors.ENDC}\n")
 
+# os-release ID / ID_LIKE values mapped to display names
+LINUX_DISTRIBUTIONS = {
+    "ubuntu": "Ubuntu",
+    "rhel": "Red Hat",
+    "fedora": "Fedora",
+}
+
+# (major, minor) from sys.getwindowsversion() mapped to client release names
+WINDOWS_RELEASES = {
+    (5, 1): "XP",
+    (5, 2): "XP",
+    (6, 0): "Vista",
+    (6, 1): "7",
+    (6, 2): "8",
+    (6, 3): "8.1",
+}
+
 def detect_os() -> tuple[str, str]:
     """
     Detect the operating system.
@@ -60,42 +81,82 @@ def detect_os() -> tuple[str, str]:
         tuple: (os_type, os_name) where os_type is 'windows' or 'linux',
                and os_name is more specific version info
     """
-    system = platform.system().lower()
-
-    if system == "windows":
-        # Try to detect Windows version
-        release = platform.release()
-
-        if release == "10":
-            return ("windows", "Windows 10")
-        elif release == "11":
-            return ("windows", "Windows 11")
+    # sys.platform and sys.getwindowsversion() are answered in-process, whereas
+    # platform.system()/release() go through uname(), which on Windows runs `ver`
+    # in a cmd.exe subprocess
+    if sys.platform == "win32":
+        winver = sys.getwindowsversion()
+
+        # product_type 1 is a workstation; servers use their own release names
+        if winver.product_type != 1:
+            release = platform.release()
+        elif winver.major == 10:
+            # Windows 11 still reports 10.0 and is told apart by its build number
+            release = "11" if winver.build >= 22000 else "10"
         else:
-            return ("windows", f"Windows {release}")
+            release = WINDOWS_RELEASES.get((winver.major, winver.minor)) or platform.release()
+        return ("windows", f"Windows {release}")
+
+    system = sys.platform
 
-    elif system == "linux":
+    if system == "linux":
         # Try to detect Linux distribution
         try:
-            with Path("/etc/os-release").open() as f:
-                os_release = f.read()
-
-            if "ubuntu" in os_release.lower():
-                return ("linux", "Ubuntu")
-            elif "red hat" in os_release.lower() or "rhel" in os_release.lower():
-                return ("linux", "Red Hat")
-            elif "fedora" in os_release.lower():
-                return ("linux", "Fedora")
-            else:
-                return ("linux", "Linux (Unknown Distribution)")
+            with Path("/etc/os-release").open("rb") as f:
+                os_release = f.read().decode("utf-8", errors="replace")
         except FileNotFoundError:
             return ("linux", "Linux (Unknown Distribution)")
 
+        # Parse KEY=VALUE lines once and dispatch on ID, then ID_LIKE
+        fields = dict(
+            line.split("=", 1)
+            for line in os_release.splitlines()
+            if "=" in line and not line.startswith("#")
+        )
+        distro_ids = [fields.get("ID", "").strip("\"'").lower()]
+        distro_ids += fields.get("ID_LIKE", "").strip("\"'").lower().split()
+
+        for distro_id in distro_ids:
+            if distro_id in LINUX_DISTRIBUTIONS:
+                return ("linux", LINUX_DISTRIBUTIONS[distro_id])
+        return ("linux", "Linux (Unknown Distribution)")
+
     elif system == "darwin":
         return ("macos", "macOS")
 
     else:
         return ("unknown", f"Unknown ({system})")
 
+def run_install_step(command: list[str], pip: bool = False) -> None:
+    """
+    Run an installer subprocess quietly.
+
+    stdout is discarded and stderr is captured so it can be shown on failure.
+    Commands are always argument lists without shell, preexec_fn or cwd, which
+    keeps CPython on its vfork/posix_spawn fast path for starting children.
+
+    Args:
+        command: Command line to execute
+        pip: Whether the command runs pip and should get non-interactive pip settings
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits with a non-zero status
+    """
+    env = None
+    if pip:
+        env = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1"}
+    subprocess.run(
+        command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env
+    )
+
+
+def print_step_error(message: str, error: subprocess.CalledProcessError) -> None:
+    """Print an error message followed by the captured stderr of a failed step."""
+    print_error(f"{message}: {error}")
+    if error.stderr:
+        print(error.stderr.decode(errors="replace"))
+
+
 def check_python_version() -> bool:
     """
     Check if Python version meets requirements (>=3.10).
@@ -113,6 +174,9 @@ def create_venv(venv_path: Path) -> bool:
     """
     Create a virtual environment.
 
+    Uses virtualenv when it is installed (it reuses cached seed wheels instead of
+    running ensurepip) and falls back to the stdlib venv module otherwise.
+
     Args:
         venv_path: Path where the venv should be created
 
@@ -121,11 +185,14 @@ def create_venv(venv_path: Path) -> bool:
     """
     try:
         print_info(f"Creating virtual environment at {venv_path}...")
-        subprocess.run([sys.executable, "-m", "venv", str(venv_path)], check=True)
+        if importlib.util.find_spec("virtualenv") is not None:
+            run_install_step([sys.executable, "-m", "virtualenv", str(venv_path)])
+        else:
+            run_install_step([sys.executable, "-m", "venv", str(venv_path)])
         print_success(f"Virtual environment created at {venv_path}")
         return True
     except subprocess.CalledProcessError as e:
-        print_error(f"Failed to create virtual environment: {e}")
+        print_step_error("Failed to create virtual environment", e)
         return False
 
 def get_venv_python(venv_path: Path, os_type: str) -> Path:
@@ -160,59 +227,213 @@ def get_venv_pip(venv_path: Path, os_type: str) -> Path:
     else:
         return venv_path / "bin" / "pip"
 
-def upgrade_pip(venv_path: Path, os_type: str) -> bool:
+def install_dependencies(
+    venv_path: Path, os_type: str, project_root: Path, extras: list[str] | None = None
+) -> bool:
     """
-    Upgrade pip in the virtual environment.
+    Upgrade pip and install project dependencies in the virtual environment.
+
+    Both steps run in a single pip invocation to pay pip's startup cost once.
 
     Args:
         venv_path: Path to the virtual environment
         os_type: Operating system type
+        project_root: Root directory of the project
+        extras: Optional dependency groups to install as well (e.g. ["dev"])
 
     Returns:
         bool: True if successful
     """
     try:
+        # Run pip as a module of the venv interpreter: one process, no pip.exe launcher
+        # stub re-exec, and pip can upgrade itself (pip.exe is locked on Windows)
         python_exe = get_venv_python(venv_path, os_type)
-        print_info("Upgrading pip...")
-        subprocess.run(
-            [str(python_exe), "-m", "pip", "install", "--upgrade", "pip"],
-            check=True,
-            capture_output=True
+        print_info("Upgrading pip and installing mcp-fess and dependencies...")
+        if extras:
+            print_info(f"Including extras: {', '.join(extras)}")
+
+        # Install in editable mode with the project; extras go into the same call,
+        # since concurrent pip runs into one venv are not safe
+        target = f"{project_root}[{','.join(extras)}]" if extras else str(project_root)
+        run_install_step(
+            [
+                str(python_exe), "-m", "pip", "install",
+                "--disable-pip-version-check", "--no-input",
+                "--upgrade", "pip",
+                "-e", target,
+            ],
+            pip=True,
         )
-        print_success("pip upgraded successfully")
+
+        print_success("Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
-        print_warning(f"Failed to upgrade pip: {e}")
+        print_step_error("Failed to install dependencies", e)
         return False
 
-def install_dependencies(venv_path: Path, os_type: str, project_root: Path) -> bool:
+def install_with_uv(
+    venv_path: Path, os_type: str, project_root: Path, extras: list[str] | None = None
+) -> bool:
     """
-    Install project dependencies in the virtual environment.
+    Create the virtual environment and install the project using uv.
+
+    uv replaces the venv creation, pip upgrade and install steps with two fast calls.
 
     Args:
-        venv_path: Path to the virtual environment
+        venv_path: Path where the venv should be created
         os_type: Operating system type
         project_root: Root directory of the project
+        extras: Optional dependency groups to install (e.g. ["dev"])
 
     Returns:
         bool: True if successful
     """
     try:
-        pip_exe = get_venv_pip(venv_path, os_type)
-        print_info("Installing mcp-fess and dependencies...")
+        print_info(f"Creating virtual environment with uv at {venv_path}...")
+        run_install_step(["uv", "venv", str(venv_path), "--seed"])
+        print_success(f"Virtual environment created at {venv_path}")
 
-        # Install in editable mode with the project
-        subprocess.run(
-            [str(pip_exe), "install", "-e", str(project_root)],
-            check=True
-        )
+        python_exe = get_venv_python(venv_path, os_type)
+        print_info("Installing mcp-fess and dependencies with uv...")
+        # uv resolves in parallel itself, so extras go into the same call
+        target = f"{project_root}[{','.join(extras)}]" if extras else str(project_root)
+        run_install_step(["uv", "pip", "install", "--python", str(python_exe), "-e", target])
 
         print_success("Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError as e:
-        print_error(f"Failed to install dependencies: {e}")
+        print_step_error("Failed to install with uv", e)
         return False
 
+VENV_CACHE_MARKER = ".mcp_fess_hash"
+
+def get_venv_cache_dir() -> Path:
+    """
+    Get the directory holding cached virtual environments.
+
+    Returns:
+        Path to the venv cache directory
+    """
+    return Path.home() / ".cache" / "mcp-fess" / "venvs"
+
+def compute_venv_cache_key(
+    project_root: Path, venv_path: Path, extras: list[str] | None = None
+) -> str:
+    """
+    Compute the cache key for a virtual environment.
+
+    The key covers pyproject.toml, the interpreter version, the installed extras
+    and both install locations, because a venv with an editable install embeds
+    absolute paths.
+
+    Args:
+        project_root: Root directory of the project
+        venv_path: Path to the virtual environment
+        extras: Optional dependency groups installed into the venv
+
+    Returns:
+        str: Short hex digest identifying the venv contents
+    """
+    h = hashlib.sha256(project_root.joinpath("pyproject.toml").read_bytes())
+    h.update(sys.version.encode("utf-8"))
+    h.update(str(project_root.resolve()).encode("utf-8"))
+    h.update(str(venv_path.resolve()).encode("utf-8"))
+    h.update(",".join(sorted(extras or [])).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    Hardlink a file for shutil.copytree, copying it when linking is not possible.
+
+    os.link uses CreateHardLinkW on Windows, so this works on every platform as
+    long as source and destination share a filesystem.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+
+    Returns:
+        str: The destination path
+    """
+    # Replace rather than write through a link that may point into the cache
+    Path(dst).unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Cross-device link or a filesystem without hardlink support
+        shutil.copy2(src, dst)
+    return dst
+
+def restore_cached_venv(venv_path: Path, cache_key: str) -> bool:
+    """
+    Restore a previously cached virtual environment.
+
+    Args:
+        venv_path: Path where the venv should be restored
+        cache_key: Cache key from compute_venv_cache_key
+
+    Returns:
+        bool: True if a matching cached venv was restored
+    """
+    cache_path = get_venv_cache_dir() / cache_key
+    marker = cache_path / VENV_CACHE_MARKER
+    if not marker.is_file() or marker.read_text().strip() != cache_key:
+        return False
+
+    try:
+        print_info(f"Restoring cached virtual environment from {cache_path}...")
+        shutil.copytree(
+            cache_path, venv_path, symlinks=True, dirs_exist_ok=True, copy_function=link_or_copy
+        )
+        print_success(f"Virtual environment restored at {venv_path}")
+        return True
+    except (OSError, shutil.Error) as e:
+        print_warning(f"Failed to restore cached virtual environment: {e}")
+        return False
+
+def store_venv_in_cache(venv_path: Path, cache_key: str) -> None:
+    """
+    Store a freshly installed virtual environment in the cache.
+
+    Args:
+        venv_path: Path to the installed virtual environment
+        cache_key: Cache key from compute_venv_cache_key
+    """
+    cache_path = get_venv_cache_dir() / cache_key
+    try:
+        venv_path.joinpath(VENV_CACHE_MARKER).write_text(cache_key)
+        if cache_path.exists():
+            shutil.rmtree(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(venv_path, cache_path, symlinks=True)
+        print_info(f"Cached virtual environment at {cache_path}")
+    except (OSError, shutil.Error) as e:
+        print_warning(f"Failed to cache virtual environment: {e}")
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write a text file only when its content differs from what is on disk.
+
+    Leaving an identical file untouched keeps its mtime stable for tools that
+    use it to detect changes.
+
+    Args:
+        path: File to write
+        content: New file content
+
+    Returns:
+        bool: True if the file was written
+    """
+    try:
+        if path.read_text() == content:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    with path.open("w") as f:
+        f.write(content)
+    return True
+
 def create_launcher_windows(venv_path: Path, install_dir: Path) -> bool:
     """
     Create Windows launcher script (.bat file).
@@ -235,10 +456,10 @@ REM This script starts the MCP-Fess server without requiring manual venv activat
 "{python_exe}" -m mcp_fess %*
 """
 
-        with launcher_path.open("w") as f:
-            f.write(launcher_content)
-
-        print_success(f"Windows launcher created: {launcher_path}")
+        if write_if_changed(launcher_path, launcher_content):
+            print_success(f"Windows launcher created: {launcher_path}")
+        else:
+            print_success(f"Windows launcher is up to date: {launcher_path}")
         print_info(f"You can now run the server with: {launcher_path}")
         return True
     except Exception as e:
@@ -267,13 +488,16 @@ def create_launcher_unix(venv_path: Path, install_dir: Path) -> bool:
 "{python_exe}" -m mcp_fess "$@"
 """
 
-        with launcher_path.open("w") as f:
-            f.write(launcher_content)
+        written = write_if_changed(launcher_path, launcher_content)
 
         # Make the script executable
-        launcher_path.chmod(0o755)
+        if launcher_path.stat().st_mode & 0o777 != 0o755:
+            launcher_path.chmod(0o755)
 
-        print_success(f"Unix launcher created: {launcher_path}")
+        if written:
+            print_success(f"Unix launcher created: {launcher_path}")
+        else:
+            print_success(f"Unix launcher is up to date: {launcher_path}")
         print_info(f"You can now run the server with: ./{launcher_path}")
         return True
     except Exception as e:
@@ -360,6 +584,19 @@ def main() -> int:
         action="store_true",
         help="Skip creating initial configuration file"
     )
+    parser.add_argument(
+        "--extra",
+        dest="extras",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Also install an optional dependency group, e.g. dev (can be repeated)"
+    )
+    parser.add_argument(
+        "--no-venv-cache",
+        action="store_true",
+        help="Always install from scratch instead of restoring a cached virtual environment"
+    )
 
     args = parser.parse_args()
 
@@ -387,16 +624,25 @@ def main() -> int:
     print_info(f"Project root: {project_root}")
     print_info(f"Virtual environment will be created at: {venv_path}")
 
-    # Create virtual environment
-    if not create_venv(venv_path):
-        return 1
+    cache_key = compute_venv_cache_key(project_root, venv_path, args.extras)
 
-    # Upgrade pip
-    upgrade_pip(venv_path, os_type)
+    if not args.no_venv_cache and restore_cached_venv(venv_path, cache_key):
+        # Cache hit: pyproject.toml is unchanged, nothing to install
+        pass
+    elif shutil.which("uv"):
+        # Fast path: uv creates the venv and installs everything
+        if not install_with_uv(venv_path, os_type, project_root, args.extras):
+            return 1
+        store_venv_in_cache(venv_path, cache_key)
+    else:
+        # Create virtual environment
+        if not create_venv(venv_path):
+            return 1
 
-    # Install dependencies
-    if not install_dependencies(venv_path, os_type, project_root):
-        return 1
+        # Upgrade pip and install dependencies
+        if not install_dependencies(venv_path, os_type, project_root, args.extras):
+            return 1
+        store_venv_in_cache(venv_path, cache_key)
 
     # Create launcher script
     print_header("Creating Launcher Script")
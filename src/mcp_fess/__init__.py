@@ -1,8 +1,26 @@
 """MCP Server for Fess - A Model Context Protocol server implementation for Fess search."""
 
-from .app import mcp
-from .server import FessServer, main
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .app import mcp
+    from .server import FessServer, main
 
 __version__ = "0.1.0"
 
 __all__ = ["FessServer", "__version__", "main", "mcp"]
+
+# Exports resolved on first access (PEP 562) so that importing a light submodule
+# such as mcp_fess.config does not pull in FastMCP, httpx and the server.
+_LAZY_EXPORTS = {"FessServer": ".server", "main": ".server", "mcp": ".app"}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule providing ``name`` on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
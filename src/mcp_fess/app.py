@@ -1,11 +1,13 @@
 """Top-level FastMCP instance for use with fastmcp run."""
 
-import json
 import logging
+import time
+from collections import OrderedDict
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Any
 
+import orjson
 from fastmcp import FastMCP
 
 from mcp_fess.config import load_config
@@ -16,6 +18,16 @@ logger = logging.getLogger("mcp_fess")
 # Module-level state
 _server_state: dict[str, Any] = {}
 
+# Recent doc_id lookups shared by the doc metadata and content resources, oldest first
+_DOC_CACHE_TTL_SECONDS = 60.0
+_DOC_CACHE_MAX_ENTRIES = 256
+_doc_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool/resource result as indented JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
 
 def _get_domain_block() -> str:
     """Generate the Knowledge Domain block for descriptions."""
@@ -28,8 +40,50 @@ name: {domain.name}
 fessLabel: {domain.labelFilter}"""
 
 
+async def _lookup_doc(doc_id: str) -> dict[str, Any]:
+    """Return the Fess document for doc_id, reusing a lookup from the last minute."""
+    cached = _doc_cache.get(doc_id)
+    if cached is not None and time.monotonic() - cached[0] < _DOC_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    config = _server_state["config"]
+    fess_client = _server_state["fess_client"]
+
+    result = await fess_client.search(
+        query=f"doc_id:{doc_id}",
+        label_filter=config.domain.labelFilter,
+        num=1,
+    )
+
+    docs = result.get("data", [])
+    if not docs:
+        raise ValueError(f"Document not found: {doc_id}")
+
+    doc: dict[str, Any] = docs[0]
+    _cache_doc(doc_id, doc)
+    return doc
+
+
+def _cache_doc(doc_id: str, doc: dict[str, Any]) -> None:
+    """Store a looked-up doc, dropping expired entries and the oldest beyond the cap."""
+    now = time.monotonic()
+    _doc_cache[doc_id] = (now, doc)
+    _doc_cache.move_to_end(doc_id)
+    # Entries are in insertion order, so expired ones are at the front
+    while _doc_cache:
+        cached_at, _ = next(iter(_doc_cache.values()))
+        if now - cached_at < _DOC_CACHE_TTL_SECONDS and len(_doc_cache) <= _DOC_CACHE_MAX_ENTRIES:
+            break
+        _doc_cache.popitem(last=False)
+
+
 def _setup_tools(app: FastMCP) -> None:
     """Set up MCP tools using FastMCP decorators."""
+    # Bound once at registration; lifespan sets the state before calling this
+    config = _server_state["config"]
+    fess_client = _server_state["fess_client"]
+    max_page_size = config.limits.maxPageSize
+    label_filter = config.domain.labelFilter
 
     @app.tool(name="fess_search")
     async def search(
@@ -41,29 +95,26 @@ def _setup_tools(app: FastMCP) -> None:
         include_fields: list[str] | None = None,
     ) -> str:
         """Search the knowledge domain for documents matching a query."""
-        config = _server_state["config"]
-        fess_client = _server_state["fess_client"]
-
         if not query:
             raise ValueError("query parameter is required")
 
-        if not isinstance(page_size, int) or page_size < 1:
+        if type(page_size) is not int or page_size < 1:
             raise ValueError("pageSize must be a positive integer")
-        page_size = min(page_size, config.limits.maxPageSize)
+        page_size = min(page_size, max_page_size)
 
-        if not isinstance(start, int) or start < 0:
+        if type(start) is not int or start < 0:
             raise ValueError("start must be a non-negative integer")
 
         result = await fess_client.search(
             query=query,
-            label_filter=config.domain.labelFilter,
+            label_filter=label_filter,
             start=start,
             num=page_size,
             sort=sort,
             lang=lang,
         )
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
 
     @app.tool(name="fess_suggest")
     async def suggest(
@@ -73,24 +124,21 @@ def _setup_tools(app: FastMCP) -> None:
         lang: str | None = None,
     ) -> str:
         """Suggest related terms for a query in the knowledge domain."""
-        config = _server_state["config"]
-        fess_client = _server_state["fess_client"]
-
         if not prefix:
             raise ValueError("prefix parameter is required")
 
-        if not isinstance(num, int) or num < 1:
+        if type(num) is not int or num < 1:
             raise ValueError("num must be a positive integer")
 
         result = await fess_client.suggest(
             prefix=prefix,
-            label=config.domain.labelFilter,
+            label=label_filter,
             num=num,
             fields=fields,
             lang=lang,
         )
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
 
     @app.tool(name="fess_popular_words")
     async def popular_words(
@@ -98,28 +146,31 @@ def _setup_tools(app: FastMCP) -> None:
         field: str | None = None,
     ) -> str:
         """Retrieve popular words in the knowledge domain."""
-        config = _server_state["config"]
-        fess_client = _server_state["fess_client"]
-
-        result = await fess_client.popular_words(
-            label=config.domain.labelFilter, seed=seed, field=field
-        )
+        result = await fess_client.popular_words(label=label_filter, seed=seed, field=field)
 
-        return json.dumps(result, indent=2)
+        return _dumps(result)
 
     @app.tool(name="fess_list_labels")
     async def list_labels() -> str:
         """List all labels configured in the underlying Fess server."""
-        fess_client = _server_state["fess_client"]
         result = await fess_client.list_labels()
-        return json.dumps(result, indent=2)
+        return _dumps(result)
 
     @app.tool(name="fess_health")
     async def health() -> str:
         """Check the health status of the underlying Fess server."""
-        fess_client = _server_state["fess_client"]
         result = await fess_client.health()
-        return json.dumps(result, indent=2)
+        return _dumps(result)
+
+    @app.tool(name="fess_status")
+    async def status() -> str:
+        """Check Fess health and list its labels in a single call."""
+        results = await fess_client.batch([fess_client.health, fess_client.list_labels])
+        status_result = {
+            key: {"error": str(result)} if isinstance(result, BaseException) else result
+            for key, result in zip(("health", "labels"), results, strict=True)
+        }
+        return _dumps(status_result)
 
     @app.tool(name="fess_job_get")
     async def job_get(job_id: str) -> str:
@@ -129,10 +180,10 @@ def _setup_tools(app: FastMCP) -> None:
 
         jobs = _server_state["jobs"]
         if job_id not in jobs:
-            return f'{{"error": "Job not found", "jobId": "{job_id}"}}'
+            return orjson.dumps({"error": "Job not found", "jobId": job_id}).decode()
 
         job = jobs[job_id]
-        return json.dumps(job, indent=2)
+        return _dumps(job)
 
 
 def _setup_resources(app: FastMCP) -> None:
@@ -141,22 +192,9 @@ def _setup_resources(app: FastMCP) -> None:
     @app.resource("fess:///doc/{doc_id}")
     async def read_doc(doc_id: str) -> str:
         """Document metadata."""
-        config = _server_state["config"]
-        fess_client = _server_state["fess_client"]
-
         try:
-            result = await fess_client.search(
-                query=f"doc_id:{doc_id}",
-                label_filter=config.domain.labelFilter,
-                num=1,
-            )
-
-            docs = result.get("data", [])
-            if not docs:
-                raise ValueError(f"Document not found: {doc_id}")
-
-            doc = docs[0]
-            return json.dumps(doc, indent=2)
+            doc = await _lookup_doc(doc_id)
+            return _dumps(doc)
 
         except Exception as e:
             logger.error(f"Failed to read resource: {e}")
@@ -169,28 +207,18 @@ def _setup_resources(app: FastMCP) -> None:
         fess_client = _server_state["fess_client"]
 
         try:
-            result = await fess_client.search(
-                query=f"doc_id:{doc_id}",
-                label_filter=config.domain.labelFilter,
-                num=1,
-            )
-
-            docs = result.get("data", [])
-            if not docs:
-                raise ValueError(f"Document not found: {doc_id}")
-
-            doc = docs[0]
+            doc = await _lookup_doc(doc_id)
             url = doc.get("url", "")
             if not url:
                 raise ValueError("Document has no URL")
 
-            content, _ = await fess_client.fetch_document_content(url, config.contentFetch)
-
-            max_chunk = config.limits.maxChunkBytes
-            if len(content) <= max_chunk:
-                return str(content)
-            else:
-                return str(content[:max_chunk])
+            content, _ = await fess_client.fetch_document_content(
+                url,
+                config.contentFetch,
+                doc_id=doc_id,
+                max_bytes=config.limits.maxChunkBytes,
+            )
+            return str(content)
 
         except Exception as e:
             logger.error(f"Failed to read resource: {e}")
@@ -208,6 +236,7 @@ async def lifespan(app: FastMCP) -> AsyncGenerator[None, None]:
     _server_state["config"] = config
     _server_state["fess_client"] = fess_client
     _server_state["jobs"] = {}
+    _doc_cache.clear()
 
     # Setup tools and resources
     _setup_tools(app)
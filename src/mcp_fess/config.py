@@ -1,14 +1,17 @@
 """Configuration management for MCP-Fess server."""
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 logger = logging.getLogger("mcp_fess")
 
+# Validated configs keyed by (path, st_mtime_ns, st_size) of the source JSON file
+_CONFIG_CACHE: dict[tuple[str, int, int], "ServerConfig"] = {}
+
 
 class LabelDescriptor(BaseModel):
     """Configuration for a single label."""
@@ -150,10 +153,23 @@ class ServerConfig(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+# Compiled once so every load reuses the same core validator
+_CONFIG_ADAPTER = TypeAdapter(ServerConfig)
+
+
+def get_config_dir() -> Path:
+    """Return the MCP-Fess configuration directory (~/.mcp-fess)."""
+    return Path.home() / ".mcp-fess"
+
+
 def load_config() -> ServerConfig:
-    """Load configuration from ~/.mcp-fess/config.json."""
-    config_dir = Path.home() / ".mcp-fess"
-    config_path = config_dir / "config.json"
+    """Load configuration from ~/.mcp-fess/config.json.
+
+    Validated configs are cached in memory keyed by the JSON file's mtime and size,
+    so unchanged configs skip JSON parsing and Pydantic validation on repeat loads.
+    Each caller gets its own deep copy, since callers may adjust their config.
+    """
+    config_path = get_config_dir() / "config.json"
 
     if not config_path.exists():
         raise FileNotFoundError(
@@ -161,18 +177,26 @@ def load_config() -> ServerConfig:
             f"Please create {config_path} with required configuration."
         )
 
+    st = config_path.stat()
+    cache_key = (str(config_path), st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached.model_copy(deep=True)
+
     try:
-        with config_path.open(encoding="utf-8") as f:
-            config_data: dict[str, Any] = json.load(f)
-        return ServerConfig(**config_data)
-    except json.JSONDecodeError as e:
+        config_data: dict[str, Any] = orjson.loads(config_path.read_bytes())
+        config = _CONFIG_ADAPTER.validate_python(config_data)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in configuration file: {e}") from e
     except Exception as e:
         raise ValueError(f"Failed to load configuration: {e}") from e
 
+    _CONFIG_CACHE[cache_key] = config
+    return config.model_copy(deep=True)
+
 
 def ensure_log_directory() -> Path:
     """Ensure log directory exists and return its path."""
-    log_dir = Path.home() / ".mcp-fess" / "log"
+    log_dir = get_config_dir() / "log"
     log_dir.mkdir(parents=True, exist_ok=True)
     return log_dir
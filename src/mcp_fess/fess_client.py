@@ -1,21 +1,36 @@
 """Fess API client."""
 
 import asyncio
+import functools
 import hashlib
+import ipaddress
 import logging
+import re
 import time
-from io import BytesIO
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Any
 from urllib.parse import urljoin
 
 import httpx
+import orjson
+import pymupdf
 from bs4 import BeautifulSoup
-from pypdf import PdfReader
 
 from .config import ContentFetchConfig
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    _HAS_SELECTOLAX = True
+except ImportError:  # pragma: no cover - optional speedup
+    _HAS_SELECTOLAX = False
+
 logger = logging.getLogger("mcp_fess")
 
+# ResponseCache key: (endpoint, sorted query parameters)
+_ResponseKey = tuple[str, tuple[tuple[str, Any], ...]]
+
 
 def truncate_text_utf8_safe(text: str, max_bytes: int) -> tuple[str, bool]:
     """
@@ -31,83 +46,394 @@ def truncate_text_utf8_safe(text: str, max_bytes: int) -> tuple[str, bool]:
     if not text:
         return text, False
 
+    # No UTF-8 character is longer than 4 bytes, so short texts cannot exceed the limit
+    if len(text) * 4 <= max_bytes:
+        return text, False
+
+    # ASCII strings have one byte per character; str.isascii() reads a cached flag
+    if text.isascii():
+        if len(text) <= max_bytes:
+            return text, False
+        return text[:max_bytes], True
+
     encoded = text.encode("utf-8")
     if len(encoded) <= max_bytes:
         return text, False
 
-    # Truncate at byte boundary and decode with error handling
-    # This will drop any partial multibyte sequence at the end
-    truncated = encoded[:max_bytes].decode("utf-8", errors="ignore")
-    return truncated, True
+    # Back up to the start of the character straddling the limit (at most 3 bytes)
+    # so the prefix is valid UTF-8 and decodes on the strict fast path
+    cut = max_bytes
+    while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+        cut -= 1
+    return encoded[:cut].decode("utf-8"), True
+
+
+# Encode and hash large contents in slices of this many characters so no full
+# UTF-8 copy of the text is held and the working set stays cache-resident
+_HASH_CHUNK_CHARS = 64 * 1024
+
+
+def content_digest(text: str) -> str:
+    """
+    Compute the content hash for extracted text.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        Hex-encoded 32-byte BLAKE2b digest of the UTF-8 encoded text
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    # UTF-8 encodes each character independently, so slicing on character
+    # boundaries yields the same byte stream as encoding the whole text
+    for start in range(0, len(text), _HASH_CHUNK_CHARS):
+        digest.update(text[start : start + _HASH_CHUNK_CHARS].encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _extract_pdf_texts(content: bytes) -> list[str]:
+    """Return the text of every page of a PDF; runs on a worker thread."""
+    with pymupdf.open(stream=content, filetype="pdf") as doc:
+        return [page.get_text("text") for page in doc]
+
+
+# Index fields holding extracted text, in priority order
+_TEXT_FIELDS = ("content", "body", "digest")
+
+# Tags whose content is never document text
+_STRIP_TAGS = ["script", "style", "meta", "link", "noscript"]
 
+# Per-endpoint TTLs for the REST response cache; other endpoints are not cached
+_RESPONSE_TTL_SECONDS = {"list_labels": 300, "popular_words": 600}
+
+# A whitespace run containing any str.splitlines() boundary; replacing these with
+# blank lines strips every line and drops empty ones in a single pass
+_LINE_BREAK_RUN = re.compile(r"\s*[\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]\s*")
+
+# Upper bound on doc_ids combined into one batched search
+_DOC_BATCH_MAX_IDS = 50
+
+
+def _normalize_text_field(value: Any) -> str:
+    """Normalize an index text field to a string (some Fess configs return lists)."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        if not any(value):
+            return ""
+        return "\n\n".join([str(item) for item in value if item])
+    return str(value).strip()
+
+
+# Hostnames treated as loopback without parsing
+_LOOPBACK_NAMES = frozenset({"localhost", "127.0.0.1", "::1"})
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_private_host(hostname: str) -> bool:
+    """Classify a hostname as private; cached since the same hosts recur."""
+    if hostname in _LOOPBACK_NAMES:
+        return True
+    try:
+        ip = ipaddress.ip_address(hostname)
+    except ValueError:
+        return False
+    return ip.is_private or ip.is_loopback or ip.is_link_local
+
+
+def _loads(response: httpx.Response) -> dict[str, Any]:
+    """Decode a Fess JSON response body with orjson."""
+    result: dict[str, Any] = orjson.loads(response.content)
+    return result
+
+
+def _limit_bytes(content: bytes | memoryview, max_bytes: int | None) -> bytes:
+    """Return content capped at max_bytes, copying only when it is cut or not bytes."""
+    if isinstance(content, bytes) and (max_bytes is None or len(content) <= max_bytes):
+        return content
+    return memoryview(content)[:max_bytes].tobytes()
 
 
 class LabelCache:
-    """Cache for Fess labels with TTL."""
+    """Cache for Fess labels with TTL.
+
+    Labels are stored as an immutable tuple that is replaced wholesale on refresh,
+    so readers can return it by reference without locking or copying. The cache is
+    only touched from the event loop thread, and writers are serialized by the
+    single in-flight fetch, so no lock is needed on either side.
+    """
 
-    def __init__(self, ttl_seconds: int = 300) -> None:
-        """Initialize label cache with TTL (default 5 minutes)."""
+    def __init__(self, ttl_seconds: int = 300, stale_ttl_seconds: int = 60) -> None:
+        """Initialize label cache with TTL (default 5 minutes).
+
+        For stale_ttl_seconds after expiry the old labels are still served while
+        a refresh runs in the background.
+        """
         self.ttl_seconds = ttl_seconds
-        self._labels: list[dict[str, Any]] = []
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self._labels: tuple[dict[str, Any], ...] = ()
         self._last_fetch: float = 0
-        self._lock = asyncio.Lock()
+        # Future of the label fetch in progress, shared by concurrent callers
+        self._inflight: asyncio.Future[tuple[dict[str, Any], ...]] | None = None
 
     def is_expired(self) -> bool:
         """Check if cache is expired."""
         return time.time() - self._last_fetch > self.ttl_seconds
 
-    async def get(self) -> list[dict[str, Any]]:
+    def is_servable_stale(self) -> bool:
+        """Check if expired labels are still within the stale-while-revalidate window."""
+        return time.time() - self._last_fetch <= self.ttl_seconds + self.stale_ttl_seconds
+
+    def get(self) -> tuple[dict[str, Any], ...]:
         """Get cached labels."""
-        async with self._lock:
-            return self._labels.copy()
+        return self._labels
 
-    async def set(self, labels: list[dict[str, Any]]) -> None:
+    def set(self, labels: list[dict[str, Any]] | tuple[dict[str, Any], ...]) -> None:
         """Set cached labels."""
-        async with self._lock:
-            self._labels = labels
-            self._last_fetch = time.time()
+        self._labels = tuple(labels)
+        self._last_fetch = time.time()
+
+
+class DocTextCache:
+    """LRU cache with TTL for extracted document text, keyed by (doc_id, label_filter)."""
+
+    def __init__(
+        self, maxsize: int = 256, ttl_seconds: int = 300, refresh_ratio: float = 0.8
+    ) -> None:
+        """Initialize the cache with a size bound and TTL (default 5 minutes).
+
+        Entries older than refresh_ratio * ttl_seconds are still served but reported
+        by needs_refresh, so callers can reload them before they expire.
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ratio = refresh_ratio
+        self._entries: OrderedDict[tuple[str, str | None], tuple[float, str]] = OrderedDict()
+
+    def get(self, key: tuple[str, str | None]) -> str | None:
+        """Get cached text, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[0] > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def needs_refresh(self, key: tuple[str, str | None]) -> bool:
+        """Check if a cached entry is close enough to expiry to be reloaded."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return time.time() - entry[0] > self.ttl_seconds * self.refresh_ratio
+
+    def set(self, key: tuple[str, str | None], text: str) -> None:
+        """Set cached text, evicting the least recently used entry when full."""
+        self._entries[key] = (time.time(), text)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class ResponseCache:
+    """TTL cache for Fess REST responses keyed by (endpoint, params) with per-entry TTL."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize the response cache with a size bound."""
+        self.maxsize = maxsize
+        self._entries: dict[_ResponseKey, tuple[float, dict[str, Any]]] = {}
+
+    @staticmethod
+    def make_key(endpoint: str, params: dict[str, Any]) -> _ResponseKey:
+        """Build a cache key from an endpoint name and its query parameters."""
+        return endpoint, tuple(sorted(params.items()))
+
+    def get(self, key: _ResponseKey) -> dict[str, Any] | None:
+        """Get a cached response, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() > entry[0]:
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def set(self, key: _ResponseKey, result: dict[str, Any], ttl_seconds: int) -> None:
+        """Cache a response for ttl_seconds, dropping the oldest entry when full."""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time() + ttl_seconds, result)
+        if len(self._entries) > self.maxsize:
+            del self._entries[next(iter(self._entries))]
 
 
 class FessClient:
     """Client for interacting with Fess REST API."""
 
-    def __init__(self, base_url: str, timeout_ms: int = 30000) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout_ms: int = 30000,
+        *,
+        http2: bool = True,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        doc_batch_window_ms: float = 0.0,
+    ) -> None:
         self.base_url = base_url
+        # Endpoint URLs resolved once instead of running urljoin on every request
+        self._url_documents = urljoin(base_url, "/api/v1/documents")
+        self._url_suggest = urljoin(base_url, "/api/v1/suggest-words")
+        self._url_popular_words = urljoin(base_url, "/api/v1/popular-words")
+        self._url_labels = urljoin(base_url, "/api/v1/labels")
+        self._url_health = urljoin(base_url, "/api/v1/health")
         self.timeout = timeout_ms / 1000.0
-        self.client = httpx.AsyncClient(timeout=self.timeout)
+        # HTTP/2 lets concurrent searches and label refreshes share one connection;
+        # the transport owns the pool, so limits and http2 are configured there
+        limits = httpx.Limits(
+            max_keepalive_connections=max_keepalive_connections,
+            max_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, retries=0)
+        # Fess compresses JSON only when asked; "br" is decoded by the brotli extra of httpx
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=transport,
+            headers={"Accept-Encoding": "gzip, deflate, br"},
+        )
         self.label_cache = LabelCache()
+        self.response_cache = ResponseCache()
+        self._label_refresh_task: asyncio.Task[tuple[dict[str, Any], ...]] | None = None
+        # Label values derived from the cached labels object they were built from
+        self._label_values_source: Any = None
+        self._cached_label_values: frozenset[str] = frozenset()
+        self.doc_text_cache = DocTextCache()
+        # Background reloads of doc texts nearing expiry, at most one per key
+        self._doc_text_refresh_tasks: dict[tuple[str, str | None], asyncio.Task[None]] = {}
+        # Per-key locks so concurrent misses for one document share a single search
+        self._doc_text_locks: dict[tuple[str, str | None], asyncio.Lock] = {}
+        # How long queued doc_id lookups wait for company; 0 flushes on the next loop turn
+        self._doc_batch_window = doc_batch_window_ms / 1000.0
+        # Queued doc_id lookups per label filter, sent together by _start_doc_flush
+        self._pending_doc_lookups: dict[
+            str | None, dict[str, asyncio.Future[dict[str, Any] | None]]
+        ] = {}
+        self._doc_flush_scheduled = False
+        self._doc_batch_tasks: set[asyncio.Task[None]] = set()
+        # doc_id -> (expires_at, content, hash) of recently hashed contents, oldest first;
+        # bounded like doc_text_cache so it never pins more texts than that cache holds
+        self._content_hash_cache: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
 
     async def close(self) -> None:
         """Close the HTTP client."""
+        if self._label_refresh_task is not None:
+            self._label_refresh_task.cancel()
+        for task in self._doc_text_refresh_tasks.values():
+            task.cancel()
         await self.client.aclose()
 
-    async def get_cached_labels(self, force_refresh: bool = False) -> list[dict[str, Any]]:
+    async def batch(self, calls: list[Callable[[], Awaitable[Any]]]) -> list[Any]:
+        """
+        Run independent Fess calls concurrently.
+
+        The calls share the client's HTTP/2 connection, so N requests are multiplexed
+        as parallel streams instead of waiting on each other's round trips.
+
+        Args:
+            calls: Zero-argument callables returning awaitables, e.g.
+                ``lambda: client.search("q")``
+
+        Returns:
+            Results in call order; a call that failed yields its exception instead
+        """
+        return await asyncio.gather(*(call() for call in calls), return_exceptions=True)
+
+    async def get_cached_labels(self, force_refresh: bool = False) -> tuple[dict[str, Any], ...]:
         """
         Get labels with caching.
 
-        Returns list of label dicts with 'name' and 'value' keys.
+        Returns a tuple of label dicts with 'name' and 'value' keys.
         Caches results for 5 minutes to avoid hitting Fess on every request.
+        Shortly after expiry the stale labels are returned while a background task
+        refreshes them; callers only wait on Fess when the cache is empty or too old.
+        Concurrent callers that miss the cache share a single fetch.
         """
-        if not force_refresh and not self.label_cache.is_expired():
-            cached = await self.label_cache.get()
+        cache = self.label_cache
+        if not force_refresh:
+            cached = cache.get()
             if cached:
-                logger.debug("Returning cached labels")
-                return cached
+                if not cache.is_expired():
+                    logger.debug("Returning cached labels")
+                    return cached
+                if cache.is_servable_stale():
+                    if self._label_refresh_task is None:
+                        logger.debug("Refreshing expired labels in the background")
+                        self._label_refresh_task = asyncio.create_task(
+                            self._refresh_labels_in_background()
+                        )
+                    return cached
+
+        return await self._refresh_labels()
+
+    async def get_cached_label_values(self) -> frozenset[str]:
+        """
+        Get the set of cached label values for membership checks.
+
+        The set is rebuilt only when get_cached_labels returns a different labels
+        object, i.e. after the cache was refreshed.
+        """
+        labels = await self.get_cached_labels()
+        if labels is not self._label_values_source:
+            self._cached_label_values = frozenset(
+                value for lbl in labels if (value := lbl.get("value"))
+            )
+            self._label_values_source = labels
+        return self._cached_label_values
 
+    async def _refresh_labels_in_background(self) -> tuple[dict[str, Any], ...]:
+        """Refresh the label cache; the cache TTL is only extended on success."""
         try:
-            logger.debug("Fetching fresh labels from Fess")
-            result = await self.list_labels()
-            labels: list[dict[str, Any]] = result.get("data", [])
-            await self.label_cache.set(labels)
+            return await self._refresh_labels()
+        finally:
+            self._label_refresh_task = None
+
+    async def _refresh_labels(self) -> tuple[dict[str, Any], ...]:
+        """Fetch labels, sharing a fetch that is already in flight."""
+        cache = self.label_cache
+        # No await between the check and the assignment, so this cannot race
+        inflight = cache._inflight
+        if inflight is not None:
+            logger.debug("Waiting for in-flight label fetch")
+            return await asyncio.shield(inflight)
+
+        inflight = asyncio.get_running_loop().create_future()
+        cache._inflight = inflight
+        try:
+            labels = await self._fetch_labels()
+            inflight.set_result(labels)
             return labels
+        finally:
+            if not inflight.done():
+                inflight.cancel()
+            cache._inflight = None
+
+    async def _fetch_labels(self) -> tuple[dict[str, Any], ...]:
+        """Fetch labels from Fess into the cache, falling back to stale labels on error."""
+        try:
+            logger.debug("Fetching fresh labels from Fess")
+            # The label cache has its own TTL; always go to Fess here
+            result = await self.list_labels(force_refresh=True)
+            self.label_cache.set(result.get("data", []))
+            return self.label_cache.get()
         except Exception as e:
             logger.warning(f"Failed to fetch labels from Fess: {e}")
             # Return cached data even if expired when Fess is down
-            cached = await self.label_cache.get()
+            cached = self.label_cache.get()
             if cached:
                 logger.info("Returning stale cached labels due to Fess error")
-                return cached
-            return []
+            return cached
 
     async def search(
         self,
@@ -121,30 +447,35 @@ class FessClient:
         **kwargs: Any,
     ) -> dict[str, Any]:
         """Search documents in Fess."""
-        params: dict[str, Any] = {"q": query, "start": start, "num": num}
+        # A list of pairs is passed to httpx as-is, without building a dict first
+        params: list[tuple[str, Any]] = [("q", query), ("start", start), ("num", num)]
 
         if label_filter:
-            params["fields.label"] = label_filter
+            params.append(("fields.label", label_filter))
         if sort:
-            params["sort"] = sort
+            params.append(("sort", sort))
         if lang:
-            params["lang"] = lang
+            params.append(("lang", lang))
 
-        for key, value in kwargs.items():
-            if value is not None:
-                params[key] = value
+        params.extend([(key, value) for key, value in kwargs.items() if value is not None])
 
-        url = urljoin(self.base_url, "/api/v1/documents")
-        logger.debug(f"Fess REST API call: GET {url} params={params}")
+        url = self._url_documents
+        logger.debug("Fess REST API call: GET %s params=%s", url, params)
 
         try:
             response = await self.client.get(url, params=params)
             response.raise_for_status()
-            result: dict[str, Any] = response.json()
-            logger.debug(
-                f"Fess REST API response: GET {url} status={response.status_code} "
-                f"hits={result.get('record_count', result.get('hit_count', len(result.get('data', []))))}"
-            )
+            result = _loads(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                hits = result.get(
+                    "record_count", result.get("hit_count", len(result.get("data", [])))
+                )
+                logger.debug(
+                    "Fess REST API response: GET %s status=%s hits=%s",
+                    url,
+                    response.status_code,
+                    hits,
+                )
             return result
         except httpx.HTTPError as e:
             logger.error(f"Fess search error: {e}")
@@ -159,35 +490,42 @@ class FessClient:
         lang: str | None = None,
     ) -> dict[str, Any]:
         """Get suggestions from Fess."""
-        params: dict[str, Any] = {"q": prefix, "num": num}
+        params: list[tuple[str, Any]] = [("q", prefix), ("num", num)]
 
         if label:
-            params["label"] = label
+            params.append(("label", label))
         if fields:
-            params["fields"] = ",".join(fields)
+            params.append(("fields", ",".join(fields)))
         if lang:
-            params["lang"] = lang
+            params.append(("lang", lang))
 
-        url = urljoin(self.base_url, "/api/v1/suggest-words")
-        logger.debug(f"Fess REST API call: GET {url} params={params}")
+        url = self._url_suggest
+        logger.debug("Fess REST API call: GET %s params=%s", url, params)
 
         try:
             response = await self.client.get(url, params=params)
             response.raise_for_status()
-            result: dict[str, Any] = response.json()
-            logger.debug(
-                f"Fess REST API response: GET {url} status={response.status_code} "
-                f"suggestions={len(result.get('data', []))}"
-            )
+            result = _loads(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Fess REST API response: GET %s status=%s suggestions=%d",
+                    url,
+                    response.status_code,
+                    len(result.get("data", [])),
+                )
             return result
         except httpx.HTTPError as e:
             logger.error(f"Fess suggest error: {e}")
             raise
 
     async def popular_words(
-        self, label: str | None = None, seed: int | None = None, field: str | None = None
+        self,
+        label: str | None = None,
+        seed: int | None = None,
+        field: str | None = None,
+        force_refresh: bool = False,
     ) -> dict[str, Any]:
-        """Get popular words from Fess."""
+        """Get popular words from Fess (cached for 10 minutes per parameter set)."""
         params: dict[str, Any] = {}
 
         if label:
@@ -197,35 +535,57 @@ class FessClient:
         if field:
             params["field"] = field
 
-        url = urljoin(self.base_url, "/api/v1/popular-words")
-        logger.debug(f"Fess REST API call: GET {url} params={params}")
+        cache_key = ResponseCache.make_key("popular_words", params)
+        if not force_refresh:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Returning cached popular words")
+                return cached
+
+        url = self._url_popular_words
+        logger.debug("Fess REST API call: GET %s params=%s", url, params)
 
         try:
             response = await self.client.get(url, params=params)
             response.raise_for_status()
-            result: dict[str, Any] = response.json()
-            logger.debug(
-                f"Fess REST API response: GET {url} status={response.status_code} "
-                f"words={len(result.get('data', []))}"
-            )
+            result = _loads(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Fess REST API response: GET %s status=%s words=%d",
+                    url,
+                    response.status_code,
+                    len(result.get("data", [])),
+                )
+            self.response_cache.set(cache_key, result, _RESPONSE_TTL_SECONDS["popular_words"])
             return result
         except httpx.HTTPError as e:
             logger.error(f"Fess popular words error: {e}")
             raise
 
-    async def list_labels(self) -> dict[str, Any]:
-        """List all labels in Fess."""
-        url = urljoin(self.base_url, "/api/v1/labels")
-        logger.debug(f"Fess REST API call: GET {url}")
+    async def list_labels(self, force_refresh: bool = False) -> dict[str, Any]:
+        """List all labels in Fess (cached for 5 minutes)."""
+        cache_key = ResponseCache.make_key("list_labels", {})
+        if not force_refresh:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Returning cached label list")
+                return cached
+
+        url = self._url_labels
+        logger.debug("Fess REST API call: GET %s", url)
 
         try:
             response = await self.client.get(url)
             response.raise_for_status()
-            result: dict[str, Any] = response.json()
-            logger.debug(
-                f"Fess REST API response: GET {url} status={response.status_code} "
-                f"labels={len(result.get('data', []))}"
-            )
+            result = _loads(response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Fess REST API response: GET %s status=%s labels=%d",
+                    url,
+                    response.status_code,
+                    len(result.get("data", [])),
+                )
+            self.response_cache.set(cache_key, result, _RESPONSE_TTL_SECONDS["list_labels"])
             return result
         except httpx.HTTPError as e:
             logger.error(f"Fess list labels error: {e}")
@@ -233,16 +593,18 @@ class FessClient:
 
     async def health(self) -> dict[str, Any]:
         """Check Fess health status."""
-        url = urljoin(self.base_url, "/api/v1/health")
-        logger.debug(f"Fess REST API call: GET {url}")
+        url = self._url_health
+        logger.debug("Fess REST API call: GET %s", url)
 
         try:
             response = await self.client.get(url)
             response.raise_for_status()
-            result: dict[str, Any] = response.json()
+            result = _loads(response)
             logger.debug(
-                f"Fess REST API response: GET {url} status={response.status_code} "
-                f"health={result.get('status', 'unknown')}"
+                "Fess REST API response: GET %s status=%s health=%s",
+                url,
+                response.status_code,
+                result.get("status", "unknown"),
             )
             return result
         except httpx.HTTPError as e:
@@ -268,57 +630,148 @@ class FessClient:
         Raises:
             ValueError: If document is not found or has no extracted text available
         """
+        key = (doc_id, label_filter)
+        cached = self.doc_text_cache.get(key)
+        if cached is not None:
+            logger.debug("Returning cached extracted text for doc_id=%s", doc_id)
+            if self.doc_text_cache.needs_refresh(key) and key not in self._doc_text_refresh_tasks:
+                # Reload ahead of expiry so hot documents never miss the cache
+                self._doc_text_refresh_tasks[key] = asyncio.create_task(self._refresh_doc_text(key))
+            return cached
+
+        lock = self._doc_text_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self.doc_text_cache.get(key)
+                if cached is not None:
+                    return cached
+                text = await self._fetch_extracted_text(doc_id, label_filter)
+                self.doc_text_cache.set(key, text)
+                return text
+        finally:
+            if not lock.locked():
+                self._doc_text_locks.pop(key, None)
+
+    async def _refresh_doc_text(self, key: tuple[str, str | None]) -> None:
+        """Reload a cached doc text in the background; failures keep the old entry."""
+        try:
+            text = await self._fetch_extracted_text(*key)
+            self.doc_text_cache.set(key, text)
+        except Exception as e:
+            logger.debug("Background refresh failed for doc_id=%s: %s", key[0], e)
+        finally:
+            self._doc_text_refresh_tasks.pop(key, None)
+
+    async def get_extracted_text_range(
+        self, doc_id: str, offset: int, length: int, label_filter: str | None = None
+    ) -> tuple[str, int]:
+        """
+        Get a character range of a document's extracted text.
+
+        The Fess search API cannot return part of a field, so the full text is
+        fetched once and kept in the document text cache; successive chunk reads
+        of the same document slice the cached text without another search.
+
+        Args:
+            doc_id: The Fess document ID
+            offset: Character offset of the range
+            length: Maximum number of characters in the range
+            label_filter: Optional label filter to apply (None for "all")
+
+        Returns:
+            Tuple of (text range, total length of the document in characters)
+
+        Raises:
+            ValueError: If document is not found or has no extracted text available
+        """
+        text = await self.get_extracted_text_by_doc_id(doc_id, label_filter=label_filter)
+        return text[offset : offset + length], len(text)
+
+    async def get_extracted_text_prefix(
+        self, doc_id: str, max_bytes: int, label_filter: str | None = None
+    ) -> tuple[str, bool, int]:
+        """
+        Get the start of a document's extracted text, up to max_bytes of UTF-8.
+
+        Like get_extracted_text_range, this is served from the document text cache,
+        because Fess cannot return part of a field.
+
+        Args:
+            doc_id: The Fess document ID
+            max_bytes: Maximum number of UTF-8 bytes in the prefix
+            label_filter: Optional label filter to apply (None for "all")
+
+        Returns:
+            Tuple of (prefix, was_truncated, total length of the document in characters)
+
+        Raises:
+            ValueError: If document is not found or has no extracted text available
+        """
+        text = await self.get_extracted_text_by_doc_id(doc_id, label_filter=label_filter)
+        prefix, was_truncated = truncate_text_utf8_safe(text, max_bytes)
+        return prefix, was_truncated, len(text)
+
+    async def get_extracted_texts_by_doc_ids(
+        self, doc_ids: list[str], label_filter: str | None = None
+    ) -> dict[str, str | Exception]:
+        """
+        Get extracted text for several documents with as few Fess searches as possible.
+
+        All lookups are started together, so uncached documents are fetched by one
+        batched doc_id search (per 50 ids) instead of one search each.
+
+        Args:
+            doc_ids: Fess document IDs; duplicates are looked up once
+            label_filter: Optional label filter to apply (None for "all")
+
+        Returns:
+            Mapping of every doc_id to its extracted text, or to the exception its
+            lookup raised (e.g. ValueError for a missing document), so callers can
+            report failures without asking Fess again
+        """
+        unique_ids = list(dict.fromkeys(doc_ids))
+        results = await asyncio.gather(
+            *(self.get_extracted_text_by_doc_id(doc_id, label_filter) for doc_id in unique_ids),
+            return_exceptions=True,
+        )
+        texts: dict[str, str | Exception] = {}
+        for doc_id, result in zip(unique_ids, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                # Cancellation and interpreter exits are not per-document failures
+                raise result
+            texts[doc_id] = result
+        return texts
+
+    async def _fetch_extracted_text(self, doc_id: str, label_filter: str | None) -> str:
+        """Fetch extracted text for doc_id from the Fess index, bypassing the cache."""
         logger.debug(
-            f"Fetching extracted text from Fess index for doc_id={doc_id}, "
-            f"label_filter={label_filter}"
+            "Fetching extracted text from Fess index for doc_id=%s, label_filter=%s",
+            doc_id,
+            label_filter,
         )
 
         try:
-            # Search for the specific document by ID
-            result = await self.search(
-                query=f"doc_id:{doc_id}", label_filter=label_filter, num=1, start=0
-            )
-            docs = result.get("data", [])
+            # Search for the specific document by ID, batched with concurrent lookups
+            doc = await self._lookup_doc_batched(doc_id, label_filter)
 
-            if not docs:
+            if doc is None:
                 raise ValueError(f"Document not found for doc_id={doc_id}")
 
-            doc = docs[0]
-
-            # Text field priority: content → body → digest
-            # Normalize to handle list types (some Fess configs return lists)
-            def normalize_field(value: Any) -> str:
-                """Normalize field value to string."""
-                if value is None:
-                    return ""
-                if isinstance(value, list):
-                    # Join list items if it's a list
-                    return "\n\n".join(str(item) for item in value if item)
-                return str(value).strip()
-
-            content = normalize_field(doc.get("content"))
-            if content:
-                logger.info(
-                    f"Retrieved content from 'content' field for doc_id={doc_id}, "
-                    f"length={len(content)}"
-                )
-                return content
-
-            body = normalize_field(doc.get("body"))
-            if body:
-                logger.info(
-                    f"Retrieved content from 'body' field for doc_id={doc_id}, "
-                    f"length={len(body)}"
-                )
-                return body
-
-            digest = normalize_field(doc.get("digest"))
-            if digest:
-                logger.info(
-                    f"Retrieved content from 'digest' field for doc_id={doc_id}, "
-                    f"length={len(digest)}"
-                )
-                return digest
+            # First non-empty field in priority order; later fields are not touched
+            for field in _TEXT_FIELDS:
+                value = doc.get(field)
+                # Missing and empty fields skip the normalization call entirely
+                if not value:
+                    continue
+                text = _normalize_text_field(value)
+                if text:
+                    logger.info(
+                        "Retrieved content from %r field for doc_id=%s, length=%d",
+                        field,
+                        doc_id,
+                        len(text),
+                    )
+                    return text
 
             # No text available
             raise ValueError(
@@ -336,6 +789,78 @@ class FessClient:
                 f"Unable to fetch extracted text for {doc_id} from Fess index: {e}"
             ) from e
 
+    def _lookup_doc_batched(
+        self, doc_id: str, label_filter: str | None
+    ) -> asyncio.Future[dict[str, Any] | None]:
+        """
+        Queue a doc_id lookup to be sent with other lookups from the same loop turn.
+
+        Lookups queued before the event loop gets back to its callbacks, or within
+        doc_batch_window_ms when set, are sent as one search per label filter, so
+        a burst of document fetches costs one Fess round trip instead of one each.
+
+        Returns:
+            Future resolving to the document dict, or None if it was not found
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending_doc_lookups.setdefault(label_filter, {})
+        future = pending.get(doc_id)
+        if future is None:
+            future = loop.create_future()
+            pending[doc_id] = future
+        if not self._doc_flush_scheduled:
+            self._doc_flush_scheduled = True
+            if self._doc_batch_window > 0:
+                loop.call_later(self._doc_batch_window, self._start_doc_flush)
+            else:
+                loop.call_soon(self._start_doc_flush)
+        return future
+
+    def _start_doc_flush(self) -> None:
+        """Send all queued doc_id lookups."""
+        pending = self._pending_doc_lookups
+        self._pending_doc_lookups = {}
+        self._doc_flush_scheduled = False
+        for label_filter, futures in pending.items():
+            doc_ids = list(futures)
+            for start in range(0, len(doc_ids), _DOC_BATCH_MAX_IDS):
+                chunk = doc_ids[start : start + _DOC_BATCH_MAX_IDS]
+                batch = {doc_id: futures[doc_id] for doc_id in chunk}
+                task = asyncio.create_task(self._run_doc_batch(label_filter, batch))
+                # Keep a reference until the task is done so it is not garbage collected
+                self._doc_batch_tasks.add(task)
+                task.add_done_callback(self._doc_batch_tasks.discard)
+
+    async def _run_doc_batch(
+        self, label_filter: str | None, futures: dict[str, asyncio.Future[dict[str, Any] | None]]
+    ) -> None:
+        """Look up a batch of doc_ids with one search and resolve their futures."""
+        doc_ids = list(futures)
+        if len(doc_ids) == 1:
+            query = f"doc_id:{doc_ids[0]}"
+        else:
+            query = "doc_id:(" + " OR ".join(doc_ids) + ")"
+
+        try:
+            result = await self.search(
+                query=query, label_filter=label_filter, num=len(doc_ids), start=0
+            )
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        docs: list[dict[str, Any]] = result.get("data", [])
+        if len(doc_ids) == 1:
+            # Single lookups keep the previous behaviour of taking the top hit
+            docs_by_id = {doc_ids[0]: docs[0]} if docs else {}
+        else:
+            docs_by_id = {doc.get("doc_id", ""): doc for doc in docs}
+        for doc_id, future in futures.items():
+            if not future.done():
+                future.set_result(docs_by_id.get(doc_id))
+
     async def fetch_document_content_by_id(self, doc_id: str) -> tuple[str, str]:
         """
         Fetch document content from Fess by document ID.
@@ -352,15 +877,42 @@ class FessClient:
         Raises:
             ValueError: If document cannot be fetched
         """
-        logger.debug(f"Fetching document content by ID from Fess index: {doc_id}")
+        logger.debug("Fetching document content by ID from Fess index: %s", doc_id)
 
         # Use the new index-only method
         content = await self.get_extracted_text_by_doc_id(doc_id, label_filter=None)
-        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
-        return content, content_hash
+        return content, self._get_content_hash(doc_id, content)
+
+    def _get_content_hash(self, doc_id: str, content: str) -> str:
+        """Return the content hash, reusing the cached one if the content is unchanged."""
+        now = time.time()
+        cached = self._content_hash_cache.get(doc_id)
+        # Comparing against the cached text is far cheaper than encoding and hashing it
+        if (
+            cached is not None
+            and cached[0] > now
+            and (cached[1] is content or cached[1] == content)
+        ):
+            return cached[2]
+
+        content_hash = content_digest(content)
+        cache = self._content_hash_cache
+        cache[doc_id] = (now + self.label_cache.ttl_seconds, content, content_hash)
+        cache.move_to_end(doc_id)
+        # Entries share one TTL, so expired ones are at the front
+        while cache:
+            expires_at = next(iter(cache.values()))[0]
+            if expires_at > now and len(cache) <= self.doc_text_cache.maxsize:
+                break
+            cache.popitem(last=False)
+        return content_hash
 
     async def fetch_document_content(
-        self, url: str, config: ContentFetchConfig, doc_id: str | None = None
+        self,
+        url: str,
+        config: ContentFetchConfig,
+        doc_id: str | None = None,
+        max_bytes: int | None = None,
     ) -> tuple[str, str]:
         """
         Fetch document content from Fess index only.
@@ -372,6 +924,8 @@ class FessClient:
             url: The document URL (used for logging only, not fetched)
             config: Content fetch configuration (for compatibility)
             doc_id: Document ID (required for content retrieval)
+            max_bytes: Optional UTF-8 byte limit applied to the returned content;
+                the hash is always computed over the full content
 
         Returns:
             Tuple of (content, hash)
@@ -388,71 +942,81 @@ class FessClient:
                 "Content is now retrieved exclusively from the Fess index."
             )
 
-        scheme = url.split("://")[0].lower() if url and "://" in url else ""
-        logger.debug(
-            f"fetch_document_content called: url={url} doc_id={doc_id} url_scheme={scheme!r} "
-            f"(index-only retrieval; URL is not fetched)"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            scheme = url.split("://")[0].lower() if url and "://" in url else ""
+            logger.debug(
+                "fetch_document_content called: url=%s doc_id=%s url_scheme=%r "
+                "(index-only retrieval; URL is not fetched)",
+                url,
+                doc_id,
+                scheme,
+            )
 
         logger.info(
-            f"Fetching content from Fess index for doc_id={doc_id} (url={url}, source=fess_index)"
+            "Fetching content from Fess index for doc_id=%s (url=%s, source=fess_index)",
+            doc_id,
+            url,
         )
 
         # Use the new index-only method
-        return await self.fetch_document_content_by_id(doc_id)
+        content, content_hash = await self.fetch_document_content_by_id(doc_id)
+        if max_bytes is not None:
+            content, _ = truncate_text_utf8_safe(content, max_bytes)
+        return content, content_hash
 
     def _is_private_network(self, hostname: str) -> bool:
         """Check if hostname is a private network address."""
         if not hostname:
             return False
+        return _is_private_host(hostname)
 
-        if hostname in ["localhost", "127.0.0.1", "::1"]:
-            return True
+    def _extract_text_from_html(
+        self, content: bytes | memoryview, max_bytes: int | None = None
+    ) -> str:
+        """Extract text from HTML content.
 
-        parts = hostname.split(".")
-        if len(parts) == 4:
+        Uses selectolax's C parser when installed, falling back to BeautifulSoup when
+        it is missing or fails on the document. Content beyond max_bytes is cut off
+        before it reaches the parser.
+        """
+        content = _limit_bytes(content, max_bytes)
+        text: str | None = None
+        if _HAS_SELECTOLAX:
             try:
-                first = int(parts[0])
-                second = int(parts[1])
-                if first == 10:
-                    return True
-                if first == 172 and 16 <= second <= 31:
-                    return True
-                if first == 192 and second == 168:
-                    return True
-            except ValueError:
-                pass
-
-        return False
-
-    def _extract_text_from_html(self, content: bytes) -> str:
-        """Extract text from HTML content."""
+                tree = LexborHTMLParser(content)
+                tree.strip_tags(_STRIP_TAGS)
+                root = tree.root
+                text = root.text(separator="\n", strip=True) if root is not None else ""
+            except Exception as e:
+                logger.debug("selectolax failed to parse HTML, using BeautifulSoup: %s", e)
         try:
-            soup = BeautifulSoup(content, "html.parser")
+            if text is None:
+                soup = BeautifulSoup(content, "html.parser")
 
-            for script in soup(["script", "style", "meta", "link"]):
-                script.decompose()
+                for script in soup.find_all(_STRIP_TAGS):
+                    script.decompose()
 
-            text = soup.get_text(separator="\n", strip=True)
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            return "\n\n".join(lines)
+                text = soup.get_text(separator="\n", strip=True)
+            return _LINE_BREAK_RUN.sub("\n\n", text).strip()
         except Exception as e:
             logger.warning(f"Failed to parse HTML: {e}")
             return content.decode("utf-8", errors="ignore")
 
-    def _extract_text_from_pdf(self, content: bytes) -> str:
-        """Extract text from PDF content."""
-        try:
-            pdf_file = BytesIO(content)
-            reader = PdfReader(pdf_file)
-
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+    async def _extract_text_from_pdf(
+        self, content: bytes | memoryview, max_bytes: int | None = None
+    ) -> str:
+        """Extract text from PDF content.
 
-            return "\n\n".join(text_parts)
+        Text is extracted with MuPDF on a worker thread, off the event loop.
+        PDFs larger than max_bytes are rejected, as a truncated PDF cannot be parsed.
+        """
+        if max_bytes is not None and len(content) > max_bytes:
+            raise ValueError(f"PDF exceeds maximum size of {max_bytes} bytes")
+        # The thread parses while the loop runs on, so give it an immutable bytes copy
+        content = _limit_bytes(content, None)
+        try:
+            texts = await asyncio.to_thread(_extract_pdf_texts, content)
+            return "\n\n".join([text for text in texts if text])
         except Exception as e:
             logger.warning(f"Failed to parse PDF: {e}")
             raise ValueError(f"PDF parsing failed: {e}") from e
@@ -2,6 +2,7 @@
 
 import logging
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import TextIO
@@ -13,13 +14,22 @@ class ElapsedTimeFormatter(logging.Formatter):
     def __init__(self, start_time: datetime, fmt: str | None = None) -> None:
         super().__init__(fmt)
         self.start_time = start_time
+        # Monotonic equivalent of start_time, so formatting needs no datetime math
+        # and is unaffected by wall-clock adjustments
+        self._t0 = time.monotonic() - (datetime.now() - start_time).total_seconds()
+        self._last_second = -1
+        self._last_elapsed = ""
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with elapsed time."""
-        elapsed = datetime.now() - self.start_time
-        hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
-        minutes, seconds = divmod(remainder, 60)
-        record.elapsed_time = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        elapsed = int(time.monotonic() - self._t0)
+        # Records within the same second share the formatted string
+        if elapsed != self._last_second:
+            hours, remainder = divmod(elapsed, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            self._last_elapsed = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+            self._last_second = elapsed
+        record.elapsed_time = self._last_elapsed
         return super().format(record)
 
 
@@ -3,6 +3,9 @@
 import argparse
 import asyncio
 import base64
+import bisect
+import functools
+import heapq
 import json
 import logging
 import mimetypes
@@ -10,64 +13,176 @@ import re
 import sys
 from pathlib import Path
 from typing import Any
+from urllib.parse import unquote, urlparse
 
+import orjson
 from fastmcp import FastMCP
 from fastmcp.resources import ResourceContent, ResourceResult
 
-from .config import ServerConfig, ensure_log_directory, load_config
+from .config import LabelDescriptor, ServerConfig, ensure_log_directory, load_config
 from .fess_client import FessClient
 from .logging_utils import setup_logging
 
+try:
+    import ahocorasick
+
+    _HAS_AHOCORASICK = True
+except ImportError:  # pragma: no cover - optional speedup
+    _HAS_AHOCORASICK = False
+
 logger = logging.getLogger("mcp_fess")
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool/resource result as indented JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def _compact_dumps(obj: Any) -> str:
+    """Serialize a large or machine-facing result as compact JSON.
+
+    Falls back to indented output while debug logging is enabled.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        return _dumps(obj)
+    return orjson.dumps(obj).decode()
+
+
+def _chunk_response(
+    chunk: str, has_more: bool, offset: int, total_length: int, max_chunk_size: int
+) -> str:
+    """Encode a fetch_content_chunk result.
+
+    The result always has the same keys, so outside debug logging it is written
+    straight into a template with only the content going through orjson.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        return _dumps(
+            {
+                "content": chunk,
+                "hasMore": has_more,
+                "offset": offset,
+                "length": len(chunk),
+                "totalLength": total_length,
+                "metadata": {"max_chunk_size": max_chunk_size},
+            }
+        )
+    content = orjson.dumps(chunk).decode()
+    more = "true" if has_more else "false"
+    return (
+        f'{{"content":{content},"hasMore":{more},"offset":{offset:d},"length":{len(chunk):d},'
+        f'"totalLength":{total_length:d},"metadata":{{"max_chunk_size":{max_chunk_size:d}}}}}'
+    )
+
+
+# Boolean operators dropped from queries before extracting highlight terms
+_OPERATOR_RE = re.compile(r"\b(?:AND|OR|NOT)\b", re.IGNORECASE)
+_PUNCT_STRIP = ".,;:!?()[]{}|\\"
+_QUOTE_DELETE = str.maketrans("", "", "\"'")
+
+
 def _extract_query_terms(query: str) -> list[str]:
     """Extract searchable terms from a query string, stripping operators and punctuation."""
-    cleaned = re.sub(r"\b(AND|OR|NOT)\b", " ", query, flags=re.IGNORECASE)
-    cleaned = cleaned.replace('"', "").replace("'", "")
-    terms = []
-    for token in cleaned.split():
-        token = token.strip(".,;:!?()[]{}|\\")
-        if token and len(token) > 1:
-            terms.append(token)
-    return terms
+    cleaned = _OPERATOR_RE.sub(" ", query).translate(_QUOTE_DELETE)
+    return [
+        token for token in (raw.strip(_PUNCT_STRIP) for raw in cleaned.split()) if len(token) > 1
+    ]
+
+
+@functools.lru_cache(maxsize=128)
+def _lowered_terms(terms: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    """Pair each term with its lowercase form, longest terms first.
+
+    Cached so a query's terms are lowercased and sorted once, not per fragment.
+    """
+    return tuple((term, term.lower()) for term in sorted(terms, key=len, reverse=True))
 
 
 def _apply_highlight(fragment: str, terms: list[str], tag_pre: str, tag_post: str) -> str:
     """Apply highlight tags to matched terms in fragment, longest terms first, no overlaps."""
     if not terms:
         return fragment
+    return _apply_highlight_lowered(fragment, _lowered_terms(tuple(terms)), tag_pre, tag_post)
+
+
+def _highlight_single(fragment: str, term: tuple[str, str], tag_pre: str, tag_post: str) -> str:
+    """Highlight a single (term, term_lower) pair with one left-to-right find sweep."""
+    term_lower = term[1]
+    term_len = len(term[0])
+    fragment_lower = fragment.lower()
+    result: list[str] = []
+    pos = 0
+    while True:
+        idx = fragment_lower.find(term_lower, pos)
+        if idx == -1:
+            break
+        end = idx + term_len
+        result += (fragment[pos:idx], tag_pre, fragment[idx:end], tag_post)
+        pos = end
+    if not result:
+        return fragment
+    result.append(fragment[pos:])
+    return "".join(result)
+
+
+def _apply_highlight_lowered(
+    fragment: str, terms: tuple[tuple[str, str], ...], tag_pre: str, tag_post: str
+) -> str:
+    """Apply highlight tags using (term, term_lower) pairs already sorted longest first."""
+    if len(terms) == 1 and terms[0][1]:
+        return _highlight_single(fragment, terms[0], tag_pre, tag_post)
 
     fragment_lower = fragment.lower()
-    spans: list[tuple[int, int]] = []
+    # Placed spans are disjoint, so keeping starts sorted keeps ends sorted too
+    starts: list[int] = []
+    ends: list[int] = []
 
-    for term in sorted(terms, key=len, reverse=True):
-        term_lower = term.lower()
+    for term, term_lower in terms:
         pos = 0
         while pos < len(fragment):
             idx = fragment_lower.find(term_lower, pos)
             if idx == -1:
                 break
             end = idx + len(term)
-            # Skip if overlaps with an already-placed span
-            if all(e <= idx or s >= end for s, e in spans):
-                spans.append((idx, end))
+            # Only the last span starting before end can overlap [idx, end)
+            i = bisect.bisect_left(starts, end)
+            if i == 0 or ends[i - 1] <= idx:
+                starts.insert(i, idx)
+                ends.insert(i, end)
             pos = idx + 1
 
-    if not spans:
+    if not starts:
         return fragment
 
-    spans.sort()
-    result = []
+    # Tags go into the parts list as-is, so the final join is the only concatenation
+    result: list[str] = []
     pos = 0
-    for start, end in spans:
-        result.append(fragment[pos:start])
-        result.append(tag_pre + fragment[start:end] + tag_post)
+    for start, end in zip(starts, ends, strict=True):
+        result += (fragment[pos:start], tag_pre, fragment[start:end], tag_post)
         pos = end
     result.append(fragment[pos:])
     return "".join(result)
 
 
+@functools.lru_cache(maxsize=128)
+def _term_automaton(terms_lower: tuple[str, ...]) -> Any:
+    """Build an Aho-Corasick automaton mapping each term to its length.
+
+    Cached so the automaton is built once per query, not once per document.
+    """
+    automaton = ahocorasick.Automaton()
+    for term_lower in terms_lower:
+        automaton.add_word(term_lower, len(term_lower))
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=128)
+def _term_pattern(terms_lower: tuple[str, ...]) -> re.Pattern[str]:
+    """Compile an alternation of the (longest-first) terms, cached per query."""
+    return re.compile("|".join(re.escape(term_lower) for term_lower in terms_lower))
+
+
 def _generate_snippets(
     text: str,
     query_terms: list[str],
@@ -91,24 +206,34 @@ def _generate_snippets(
         suffix = "\u2026" if len(text) > size_chars else ""
         return [fragment + suffix]
 
-    text_lower = text.lower()
+    terms = _lowered_terms(tuple(query_terms))
     scan_limit = min(len(text), scan_max_chars)
+    # Only the scan window is searched, so only it is lowercased
+    scan_lower = text[:scan_limit].lower()
 
     # Collect match positions within the scan window (stop early if enough found)
     match_positions: list[int] = []
     seen: set[int] = set()
-
-    for term in query_terms:
-        term_lower = term.lower()
-        pos = 0
-        while pos < scan_limit and len(match_positions) < max_fragments * 5:
-            idx = text_lower.find(term_lower, pos, scan_limit)
-            if idx == -1:
-                break
+    max_matches = max_fragments * 5
+
+    terms_lower = tuple(term_lower for _, term_lower in terms)
+    if _HAS_AHOCORASICK:
+        # One C-level pass over the scan window finds every term, in text order
+        automaton = _term_automaton(terms_lower)
+        for end_idx, term_len in automaton.iter(scan_lower):
+            idx = end_idx - term_len + 1
             if idx not in seen:
                 match_positions.append(idx)
                 seen.add(idx)
-            pos = idx + 1
+                if len(match_positions) >= max_matches:
+                    break
+    else:
+        # Without pyahocorasick, one alternation regex still scans in C; its matches
+        # never overlap, so positions are already unique
+        for match in _term_pattern(terms_lower).finditer(scan_lower):
+            match_positions.append(match.start())
+            if len(match_positions) >= max_matches:
+                break
 
     if not match_positions:
         # No matches - return start of text as fallback
@@ -116,14 +241,17 @@ def _generate_snippets(
         suffix = "\u2026" if len(text) > size_chars else ""
         return [fragment + suffix]
 
-    match_positions.sort()
+    # Pop matches in position order from a heap: building windows usually stops
+    # after max_fragments, so most positions never need to be ordered
+    heapq.heapify(match_positions)
 
     # Build non-overlapping windows around matches
     windows: list[tuple[int, int]] = []
     last_win_end = -1
+    half = size_chars // 2
 
-    for match_pos in match_positions:
-        half = size_chars // 2
+    while match_positions:
+        match_pos = heapq.heappop(match_positions)
         win_start = max(0, match_pos - half)
         win_end = min(len(text), win_start + size_chars)
         # Adjust window if we bumped into the end
@@ -140,23 +268,25 @@ def _generate_snippets(
         if len(windows) >= max_fragments:
             break
 
-    # Build highlighted fragments
-    fragments = []
-    for win_start, win_end in windows:
-        fragment = text[win_start:win_end]
-        prefix = "\u2026" if win_start > 0 else ""
-        suffix = "\u2026" if win_end < len(text) else ""
-        highlighted = _apply_highlight(fragment, query_terms, tag_pre, tag_post)
-        fragments.append(prefix + highlighted + suffix)
-
-    return fragments
+    # Build highlighted fragments; each is assembled by one f-string rather than
+    # chained concatenation, and the list is built in a single comprehension
+    text_len = len(text)
+    ellipsis = "\u2026"
+    return [
+        f"{ellipsis if win_start > 0 else ''}"
+        f"{_apply_highlight_lowered(text[win_start:win_end], terms, tag_pre, tag_post)}"
+        f"{ellipsis if win_end < text_len else ''}"
+        for win_start, win_end in windows
+    ]
 
 
+@functools.lru_cache(maxsize=2048)
 def _file_url_to_path(value: str) -> str:
-    """Convert a file:// URL to an OS filesystem path string."""
-    if value.startswith("file://"):
-        from urllib.parse import unquote, urlparse
+    """Convert a file:// URL to an OS filesystem path string.
 
+    Results are cached, as the same documents' URLs are resolved repeatedly.
+    """
+    if value.startswith("file://"):
         parsed = urlparse(value)
         netloc = parsed.netloc
         path = unquote(parsed.path)
@@ -199,6 +329,110 @@ def _mime_type_for_image(image_path: Path) -> str:
     return "image/jpeg" if ext in (".jpg", ".jpeg") else "image/png"
 
 
+# Descriptor texts that do not depend on configuration, shared by every server instance
+_DESCRIPTOR_WORKFLOW = """**Efficient agent workflow:**
+
+1. (Optional) Call `list_labels` to pick a label scope if you need to restrict the search space.
+2. Call `search` to get relevant hits and collect `doc_id`s.
+3. Call `fetch_content_chunk` (preferred) or `fetch_content_by_id` to read extracted UTF-8 text evidence from the index.
+   - Text content may contain `<IMAGE: /absolute/path/to/image.png>` markers for extracted images.
+   - To retrieve an image, use the `fess_get_image` tool with `image_path` set to the absolute path, or read the `fess:///image/{filename}` resource where `{filename}` is the basename of the path.
+4. (Optional) Call `get_original_doc` with a `doc_id` to retrieve the original filesystem path of the source document.
+5. Refine the query using evidence; optionally use `suggest` and `popular_words` to expand/pivot."""
+
+_DESCRIPTOR_TEXT_SOURCE = (
+    "**Text source:** Index fields only (priority: `content` → `body` → `digest`). No origin URL fetch.\n"
+    "**Images:** Text content may include `<IMAGE: /absolute/path>` markers for extracted images. "
+    "Retrieve images via the `fess_get_image` tool (pass `image_path`) "
+    "or by reading the `fess:///image/{filename}` resource (use the basename of the path)."
+)
+
+
+# Docstrings of tools/resources that embed configured limits; filled in per instance
+# with str.format_map in _setup_tools and _setup_resources.
+_TOOL_DOC_TEMPLATES: dict[str, str] = {
+    "search": """Search the Fess index and return ranked document hits.
+Use this first to turn a keyword/question into a shortlist of candidate documents (capture `doc_id`).
+
+{workflow}
+
+**Note:** Search hits may include only short summary/snippet fields. For substantial text evidence, always use the content fetch tool/resource.
+
+**Performance:** Use `include_fields` to limit payload to the fields you need.
+
+**Snippets (optional):** Set `snippets=true` to attach client-side generated text snippets to each hit.
+Snippets are generated by mcp-fess from index text (priority: `content` → `body` → `digest`);
+they are NOT Fess highlight fragments. Snippet size and count are clamped to configured limits.
+Snippets may contain `<IMAGE: /absolute/path>` markers for images extracted from the source document;
+use the `fess_get_image` tool (pass `image_path`) or read `fess:///image/{{filename}}` resource to retrieve them.
+For long-form evidence, prefer `fetch_content_chunk` instead.
+
+Args:
+    query: Search term
+    label: Label value to scope the search (default uses configured defaultLabel).
+           Use 'all' to search across the entire index without label filtering.
+           Call list_labels to see available labels.
+    page_size: Number of results per page (default 20, max {maxPageSize})
+    start: Starting index for pagination (default 0)
+    sort: Sort order
+    lang: Search language
+    include_fields: Fields to include in results
+    snippets: Set to true to attach generated snippets to each hit (default false)
+    snippet_size_chars: Desired chars per snippet fragment (clamped to [{snippetMinChars}, {snippetMaxChars}], default {snippetDefaultChars})
+    snippet_fragments: Max fragments per hit (clamped to [1, {snippetMaxFragments}], default {snippetDefaultFragments})
+    snippet_docs: Max hits to enrich with snippets (clamped to [1, {snippetMaxDocs}], default {snippetDefaultDocs})
+    snippet_tag_pre: Opening highlight tag (default '<em>')
+    snippet_tag_post: Closing highlight tag (default '</em>')
+    snippet_scan_max_chars: Max chars of document text to scan for matches (default {snippetScanMaxChars})""",
+    "fetch_content_by_id": """Fetch extracted UTF-8 text for a document from the Fess index in one call (no origin URL fetch).
+
+Use when the document is expected to fit within the server's maximum chunk limit or when you want a quick read without managing offsets.
+If the document exceeds the limit, content is truncated; use `fetch_content_chunk` for full traversal.
+
+{text_source}
+{limits}
+
+Args:
+    doc_id: Document ID obtained from search results (required)
+
+Returns:
+    JSON with:
+    - 'content': The document content (up to maximum chunk size)
+    - 'totalLength': Total document length in characters
+    - 'truncated': Boolean indicating if content was truncated due to size limits""",
+    "fetch_content_chunk": """Fetch a window of extracted UTF-8 text for a document from the Fess index (no origin URL fetch).
+
+Use this after `search` when you need substantial evidence (sections/chapters/whole documents).
+
+**Chunking strategy:**
+
+* Start with `offset=0`.
+* Request a `length` up to the server's maximum chunk limit.
+* If `hasMore=true`, set `offset = offset + returned_length` and call again.
+* Repeat until `hasMore=false`.
+
+{text_source}
+{limits}
+
+Args:
+    doc_id: Document ID obtained from search results (required)
+    offset: Character offset into document (default 0 - start from beginning)
+    length: Number of characters to return (default maximum chunk size)
+
+Returns:
+    JSON with:
+    - 'content': The requested text chunk
+    - 'hasMore': Boolean indicating if more content exists beyond this chunk
+    - 'offset': The starting position of this chunk
+    - 'length': Actual length of returned content
+    - 'totalLength': Total document length in characters""",
+    "read_doc_content": """Document extracted text (index-only). Returns up to the server's maximum chunk limit.
+For longer documents, use `fetch_content_chunk` to iterate through the full extracted text.
+
+{limits}""",
+}
+
+
 class FessServer:
     """MCP server implementation for Fess."""
 
@@ -211,20 +445,60 @@ class FessServer:
         self.mcp = FastMCP(name=server_name)
         self.jobs: dict[str, dict[str, Any]] = {}
         self.default_label = config.get_effective_default_label()
+        # Fess labels object, config label snapshot and strictLabels the last
+        # list_labels response was built from, followed by that response
+        self._list_labels_response: (
+            tuple[Any, tuple[tuple[str, LabelDescriptor], ...], bool, str] | None
+        ) = None
 
         # Ensure "all" label is always in config
         if "all" not in self.config.labels:
-            from .config import LabelDescriptor
-
             self.config.labels["all"] = LabelDescriptor(
                 title="All documents",
                 description="Search across the whole Fess index without label filtering.",
                 examples=["company policy", "project documentation"],
             )
 
+        # Static fields of each configured label's list_labels row, with the descriptor
+        # they were built from so a replaced descriptor gets a fresh row
+        self._label_row_templates: dict[str, tuple[LabelDescriptor, dict[str, Any]]] = {
+            value: (descriptor, self._label_row_template(value, descriptor))
+            for value, descriptor in self.config.labels.items()
+        }
+
+        # Values substituted into _TOOL_DOC_TEMPLATES, built once per instance
+        limits = self.config.limits
+        self._doc_ctx: dict[str, Any] = {
+            "maxPageSize": limits.maxPageSize,
+            "snippetMinChars": limits.snippetMinChars,
+            "snippetMaxChars": limits.snippetMaxChars,
+            "snippetDefaultChars": limits.snippetDefaultChars,
+            "snippetMaxFragments": limits.snippetMaxFragments,
+            "snippetDefaultFragments": limits.snippetDefaultFragments,
+            "snippetMaxDocs": limits.snippetMaxDocs,
+            "snippetDefaultDocs": limits.snippetDefaultDocs,
+            "snippetScanMaxChars": limits.snippetScanMaxChars,
+            "workflow": self._descriptor_workflow(),
+            "text_source": self._descriptor_text_source(),
+            "limits": self._descriptor_limits(),
+        }
+
         self._setup_tools()
         self._setup_resources()
 
+    @staticmethod
+    def _label_row_template(value: str, descriptor: LabelDescriptor) -> dict[str, Any]:
+        """Build the list_labels row for a configured label, minus the Fess fields."""
+        return {
+            "value": value,
+            "name": "",
+            "title": descriptor.title,
+            "description": descriptor.description,
+            "examples": descriptor.examples,
+            "isConfigured": True,
+            "isPresentInFess": False,
+        }
+
     def _get_domain_block(self) -> str:
         """Generate the Knowledge Domain block for descriptions."""
         domain = self.config.domain
@@ -235,25 +509,12 @@ name: {domain.name}
 fessLabel: {domain.labelFilter}"""
 
     def _descriptor_workflow(self) -> str:
-        """Generate the shared efficient agent workflow text."""
-        return """**Efficient agent workflow:**
-
-1. (Optional) Call `list_labels` to pick a label scope if you need to restrict the search space.
-2. Call `search` to get relevant hits and collect `doc_id`s.
-3. Call `fetch_content_chunk` (preferred) or `fetch_content_by_id` to read extracted UTF-8 text evidence from the index.
-   - Text content may contain `<IMAGE: /absolute/path/to/image.png>` markers for extracted images.
-   - To retrieve an image, use the `fess_get_image` tool with `image_path` set to the absolute path, or read the `fess:///image/{filename}` resource where `{filename}` is the basename of the path.
-4. (Optional) Call `get_original_doc` with a `doc_id` to retrieve the original filesystem path of the source document.
-5. Refine the query using evidence; optionally use `suggest` and `popular_words` to expand/pivot."""
+        """Return the shared efficient agent workflow text."""
+        return _DESCRIPTOR_WORKFLOW
 
     def _descriptor_text_source(self) -> str:
-        """Generate the text source explanation."""
-        return (
-            "**Text source:** Index fields only (priority: `content` → `body` → `digest`). No origin URL fetch.\n"
-            "**Images:** Text content may include `<IMAGE: /absolute/path>` markers for extracted images. "
-            "Retrieve images via the `fess_get_image` tool (pass `image_path`) "
-            "or by reading the `fess:///image/{filename}` resource (use the basename of the path)."
-        )
+        """Return the text source explanation."""
+        return _DESCRIPTOR_TEXT_SOURCE
 
     def _descriptor_limits(self) -> str:
         """Generate the limits description with actual configured values."""
@@ -299,39 +560,7 @@ fessLabel: {domain.labelFilter}"""
             )
 
         # Set dynamic descriptor for search tool
-        search.__doc__ = f"""Search the Fess index and return ranked document hits.
-Use this first to turn a keyword/question into a shortlist of candidate documents (capture `doc_id`).
-
-{self._descriptor_workflow()}
-
-**Note:** Search hits may include only short summary/snippet fields. For substantial text evidence, always use the content fetch tool/resource.
-
-**Performance:** Use `include_fields` to limit payload to the fields you need.
-
-**Snippets (optional):** Set `snippets=true` to attach client-side generated text snippets to each hit.
-Snippets are generated by mcp-fess from index text (priority: `content` → `body` → `digest`);
-they are NOT Fess highlight fragments. Snippet size and count are clamped to configured limits.
-Snippets may contain `<IMAGE: /absolute/path>` markers for images extracted from the source document;
-use the `fess_get_image` tool (pass `image_path`) or read `fess:///image/{{filename}}` resource to retrieve them.
-For long-form evidence, prefer `fetch_content_chunk` instead.
-
-Args:
-    query: Search term
-    label: Label value to scope the search (default uses configured defaultLabel).
-           Use 'all' to search across the entire index without label filtering.
-           Call list_labels to see available labels.
-    page_size: Number of results per page (default 20, max {self.config.limits.maxPageSize})
-    start: Starting index for pagination (default 0)
-    sort: Sort order
-    lang: Search language
-    include_fields: Fields to include in results
-    snippets: Set to true to attach generated snippets to each hit (default false)
-    snippet_size_chars: Desired chars per snippet fragment (clamped to [{self.config.limits.snippetMinChars}, {self.config.limits.snippetMaxChars}], default {self.config.limits.snippetDefaultChars})
-    snippet_fragments: Max fragments per hit (clamped to [1, {self.config.limits.snippetMaxFragments}], default {self.config.limits.snippetDefaultFragments})
-    snippet_docs: Max hits to enrich with snippets (clamped to [1, {self.config.limits.snippetMaxDocs}], default {self.config.limits.snippetDefaultDocs})
-    snippet_tag_pre: Opening highlight tag (default '<em>')
-    snippet_tag_post: Closing highlight tag (default '</em>')
-    snippet_scan_max_chars: Max chars of document text to scan for matches (default {self.config.limits.snippetScanMaxChars})"""
+        search.__doc__ = _TOOL_DOC_TEMPLATES["search"].format_map(self._doc_ctx)
 
         @self.mcp.tool(name="fess_suggest")
         async def suggest(
@@ -411,22 +640,9 @@ Args:
             return await self._handle_fetch_content_by_id({"docId": doc_id})
 
         # Set dynamic descriptor for fetch_content_by_id tool
-        fetch_content_by_id.__doc__ = f"""Fetch extracted UTF-8 text for a document from the Fess index in one call (no origin URL fetch).
-
-Use when the document is expected to fit within the server's maximum chunk limit or when you want a quick read without managing offsets.
-If the document exceeds the limit, content is truncated; use `fetch_content_chunk` for full traversal.
-
-{self._descriptor_text_source()}
-{self._descriptor_limits()}
-
-Args:
-    doc_id: Document ID obtained from search results (required)
-
-Returns:
-    JSON with:
-    - 'content': The document content (up to maximum chunk size)
-    - 'totalLength': Total document length in characters
-    - 'truncated': Boolean indicating if content was truncated due to size limits"""
+        fetch_content_by_id.__doc__ = _TOOL_DOC_TEMPLATES["fetch_content_by_id"].format_map(
+            self._doc_ctx
+        )
 
         @self.mcp.tool(name="fess_fetch_content_chunk")
         async def fetch_content_chunk(
@@ -441,32 +657,9 @@ Returns:
             )
 
         # Set dynamic descriptor for fetch_content_chunk tool
-        fetch_content_chunk.__doc__ = f"""Fetch a window of extracted UTF-8 text for a document from the Fess index (no origin URL fetch).
-
-Use this after `search` when you need substantial evidence (sections/chapters/whole documents).
-
-**Chunking strategy:**
-
-* Start with `offset=0`.
-* Request a `length` up to the server's maximum chunk limit.
-* If `hasMore=true`, set `offset = offset + returned_length` and call again.
-* Repeat until `hasMore=false`.
-
-{self._descriptor_text_source()}
-{self._descriptor_limits()}
-
-Args:
-    doc_id: Document ID obtained from search results (required)
-    offset: Character offset into document (default 0 - start from beginning)
-    length: Number of characters to return (default maximum chunk size)
-
-Returns:
-    JSON with:
-    - 'content': The requested text chunk
-    - 'hasMore': Boolean indicating if more content exists beyond this chunk
-    - 'offset': The starting position of this chunk
-    - 'length': Actual length of returned content
-    - 'totalLength': Total document length in characters"""
+        fetch_content_chunk.__doc__ = _TOOL_DOC_TEMPLATES["fetch_content_chunk"].format_map(
+            self._doc_ctx
+        )
 
         @self.mcp.tool(name="fess_get_original_doc")
         async def get_original_doc(document_id: str) -> str:
@@ -633,7 +826,7 @@ Returns:
                     raise ValueError(f"Document not found: {doc_id}")
 
                 doc = docs[0]
-                return json.dumps(doc, indent=2)
+                return _dumps(doc)
 
             except Exception as e:
                 logger.error(f"Failed to read resource: {e}")
@@ -674,10 +867,7 @@ Use `doc/{doc_id}/content` or the content fetch tools to retrieve extracted text
                 raise
 
         # Set dynamic descriptor for read_doc_content resource
-        read_doc_content.__doc__ = f"""Document extracted text (index-only). Returns up to the server's maximum chunk limit.
-For longer documents, use `fetch_content_chunk` to iterate through the full extracted text.
-
-{self._descriptor_limits()}"""
+        read_doc_content.__doc__ = _TOOL_DOC_TEMPLATES["read_doc_content"].format_map(self._doc_ctx)
 
         @self.mcp.resource("fess:///labels")
         async def read_labels() -> str:
@@ -799,8 +989,7 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
 
         # Check if label exists in Fess
         try:
-            fess_labels = await self.fess_client.get_cached_labels()
-            fess_label_values = {lbl.get("value") for lbl in fess_labels if lbl.get("value")}
+            fess_label_values = await self.fess_client.get_cached_label_values()
 
             if label in fess_label_values:
                 if self.config.strictLabels:
@@ -823,7 +1012,7 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
 
     async def _handle_search(self, arguments: dict[str, Any]) -> str:
         """Handle search tool."""
-        logger.debug(f"MCP tool call: search args={arguments}")
+        logger.debug("MCP tool call: search args=%s", arguments)
         query = arguments.get("query")
         if not query:
             raise ValueError("query parameter is required")
@@ -875,53 +1064,74 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
         if arguments.get("snippets"):
             snippet_params = self._validate_and_clamp_snippet_args(arguments)
             hits = result.get("data", [])
-            enrichable_hits = hits[: snippet_params["snippet_docs"]]
+            # Hits without a doc_id cannot be enriched; skip them before scheduling
+            enrichable_hits = [
+                hit for hit in hits[: snippet_params["snippet_docs"]] if hit.get("doc_id")
+            ]
             query_terms = _extract_query_terms(query)
 
-            semaphore = asyncio.Semaphore(self.config.limits.maxInFlightRequests)
+            # One batched lookup for all hits, instead of a search per hit
+            texts = await self.fess_client.get_extracted_texts_by_doc_ids(
+                [hit["doc_id"] for hit in enrichable_hits], label_filter=label_filter
+            )
 
             async def _enrich_hit(hit: dict[str, Any]) -> None:
-                async with semaphore:
-                    doc_id = hit.get("doc_id")
-                    if not doc_id:
-                        return
+                doc_id = hit["doc_id"]
+                try:
+                    text = texts[doc_id]
+                    if isinstance(text, Exception):
+                        # The batch already failed for this doc; report it without a retry
+                        raise text
+                    # CPU-bound; run off the event loop so other tool calls keep flowing
+                    snippets_list = await asyncio.to_thread(
+                        _generate_snippets,
+                        text=text,
+                        query_terms=query_terms,
+                        size_chars=snippet_params["snippet_size_chars"],
+                        max_fragments=snippet_params["snippet_fragments"],
+                        tag_pre=snippet_params["snippet_tag_pre"],
+                        tag_post=snippet_params["snippet_tag_post"],
+                        scan_max_chars=snippet_params["snippet_scan_max_chars"],
+                    )
+                    hit["mcp_snippets"] = {
+                        "requested_size_chars": arguments.get("snippet_size_chars"),
+                        "effective_size_chars": snippet_params["snippet_size_chars"],
+                        "requested_fragments": arguments.get("snippet_fragments"),
+                        "effective_fragments": snippet_params["snippet_fragments"],
+                        "source_field": "content/body/digest",
+                        "snippets": snippets_list,
+                        "clamped": snippet_params["clamped"],
+                    }
+                except Exception as e:
+                    logger.warning(f"Failed to generate snippets for doc_id={doc_id}: {e}")
+                    hit["mcp_snippets"] = {"error": str(e)}
+
+            # Fixed pool of workers draining a queue of hits, bounded by maxInFlightRequests
+            pending: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+            for hit in enrichable_hits:
+                pending.put_nowait(hit)
+
+            async def _worker() -> None:
+                while True:
                     try:
-                        text = await self.fess_client.get_extracted_text_by_doc_id(
-                            doc_id, label_filter=label_filter
-                        )
-                        snippets_list = _generate_snippets(
-                            text=text,
-                            query_terms=query_terms,
-                            size_chars=snippet_params["snippet_size_chars"],
-                            max_fragments=snippet_params["snippet_fragments"],
-                            tag_pre=snippet_params["snippet_tag_pre"],
-                            tag_post=snippet_params["snippet_tag_post"],
-                            scan_max_chars=snippet_params["snippet_scan_max_chars"],
-                        )
-                        hit["mcp_snippets"] = {
-                            "requested_size_chars": arguments.get("snippet_size_chars"),
-                            "effective_size_chars": snippet_params["snippet_size_chars"],
-                            "requested_fragments": arguments.get("snippet_fragments"),
-                            "effective_fragments": snippet_params["snippet_fragments"],
-                            "source_field": "content/body/digest",
-                            "snippets": snippets_list,
-                            "clamped": snippet_params["clamped"],
-                        }
-                    except Exception as e:
-                        logger.warning(f"Failed to generate snippets for doc_id={doc_id}: {e}")
-                        hit["mcp_snippets"] = {"error": str(e)}
+                        hit = pending.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    await _enrich_hit(hit)
 
-            await asyncio.gather(*[_enrich_hit(hit) for hit in enrichable_hits])
+            worker_count = min(len(enrichable_hits), self.config.limits.maxInFlightRequests)
+            await asyncio.gather(*[_worker() for _ in range(worker_count)])
 
-        response = json.dumps(result, indent=2)
+        response = _dumps(result)
         logger.debug(
-            f"MCP tool response: search hits={result.get('record_count', len(result.get('data', [])))}"
+            "MCP tool response: search hits=%s",
+            result.get("record_count", len(result.get("data", []))),
         )
         return response
 
     async def _handle_suggest(self, arguments: dict[str, Any]) -> str:
         """Handle suggest tool."""
-        logger.debug(f"MCP tool call: suggest args={arguments}")
+        logger.debug("MCP tool call: suggest args=%s", arguments)
         prefix = arguments.get("prefix")
         if not prefix:
             raise ValueError("prefix parameter is required")
@@ -944,13 +1154,13 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
             lang=lang,
         )
 
-        response = json.dumps(result, indent=2)
-        logger.debug(f"MCP tool response: suggest count={len(result.get('data', []))}")
+        response = _dumps(result)
+        logger.debug("MCP tool response: suggest count=%d", len(result.get("data", [])))
         return response
 
     async def _handle_popular_words(self, arguments: dict[str, Any]) -> str:
         """Handle popular words tool."""
-        logger.debug(f"MCP tool call: popular_words args={arguments}")
+        logger.debug("MCP tool call: popular_words args=%s", arguments)
         seed = arguments.get("seed")
         field = arguments.get("field")
 
@@ -959,8 +1169,8 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
 
         result = await self.fess_client.popular_words(label=label, seed=seed, field=field)
 
-        response = json.dumps(result, indent=2)
-        logger.debug(f"MCP tool response: popular_words count={len(result.get('data', []))}")
+        response = _dumps(result)
+        logger.debug("MCP tool response: popular_words count=%d", len(result.get("data", [])))
         return response
 
     async def _handle_list_labels(self) -> str:
@@ -973,6 +1183,19 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
         fess_labels_available = True
         try:
             fess_labels = await self.fess_client.get_cached_labels()
+            # The label cache hands out a new object only after a refresh, so the same
+            # object and an equal config snapshot mean the previous response still holds
+            config_labels = tuple(self.config.labels.items())
+            strict_labels = self.config.strictLabels
+            cached = self._list_labels_response
+            if (
+                cached is not None
+                and cached[0] is fess_labels
+                and cached[1] == config_labels
+                and cached[2] == strict_labels
+            ):
+                logger.debug("MCP tool response: list_labels (cached)")
+                return cached[3]
             fess_label_map: dict[str, str] = {
                 lbl.get("value", ""): lbl.get("name", "") for lbl in fess_labels if lbl.get("value")
             }
@@ -985,15 +1208,18 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
         merged_labels = []
 
         # Add all configured labels
+        templates = self._label_row_templates
         for value, descriptor in self.config.labels.items():
+            cached_row = templates.get(value)
+            if cached_row is not None and cached_row[0] is descriptor:
+                template = cached_row[1]
+            else:
+                template = self._label_row_template(value, descriptor)
+                templates[value] = (descriptor, template)
             merged_labels.append(
                 {
-                    "value": value,
+                    **template,
                     "name": fess_label_map.get(value, ""),
-                    "title": descriptor.title,
-                    "description": descriptor.description,
-                    "examples": descriptor.examples,
-                    "isConfigured": True,
                     "isPresentInFess": value in fess_label_map or value == "all",
                 }
             )
@@ -1021,8 +1247,10 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
             "fessAvailable": fess_labels_available,
         }
 
-        response = json.dumps(result, indent=2)
-        logger.debug(f"MCP tool response: list_labels count={len(merged_labels)}")
+        response = _dumps(result)
+        if fess_labels_available:
+            self._list_labels_response = (fess_labels, config_labels, strict_labels, response)
+        logger.debug("MCP tool response: list_labels count=%d", len(merged_labels))
         return response
 
     async def _handle_health(self) -> str:
@@ -1030,27 +1258,27 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
         logger.debug("MCP tool call: health")
         result = await self.fess_client.health()
 
-        response = json.dumps(result, indent=2)
-        logger.debug(f"MCP tool response: health status={result.get('status', 'unknown')}")
+        response = _compact_dumps(result)
+        logger.debug("MCP tool response: health status=%s", result.get("status", "unknown"))
         return response
 
     async def _handle_job_get(self, arguments: dict[str, Any]) -> str:
         """Handle job status query."""
-        logger.debug(f"MCP tool call: job_get args={arguments}")
+        logger.debug("MCP tool call: job_get args=%s", arguments)
         job_id = arguments.get("jobId")
         if not job_id:
             raise ValueError("jobId parameter is required")
 
-        if job_id not in self.jobs:
-            return f'{{"error": "Job not found", "jobId": "{job_id}"}}'
-
-        job = self.jobs[job_id]
+        job = self.jobs.get(job_id)
+        if job is None:
+            # Encoded rather than formatted so quotes in job_id cannot break the JSON
+            return orjson.dumps({"error": "Job not found", "jobId": job_id}).decode()
 
-        return json.dumps(job, indent=2)
+        return _dumps(job)
 
     async def _handle_fetch_content_chunk(self, arguments: dict[str, Any]) -> str:
         """Handle fetch content chunk tool."""
-        logger.debug(f"MCP tool call: fetch_content_chunk args={arguments}")
+        logger.debug("MCP tool call: fetch_content_chunk args=%s", arguments)
         doc_id = arguments.get("docId")
         if not doc_id:
             raise ValueError(
@@ -1083,30 +1311,21 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
             # Use default label if it's not "all"
             label_filter = None if self.default_label == "all" else self.default_label
 
-            # Get full extracted text from Fess index
-            content = await self.fess_client.get_extracted_text_by_doc_id(
-                doc_id, label_filter=label_filter
+            # Only the requested window is handed back; the full text stays cached
+            chunk, total_length = await self.fess_client.get_extracted_text_range(
+                doc_id, offset, length, label_filter=label_filter
             )
+            has_more = offset + length < total_length
 
-            # Slice content at character level
-            chunk = content[offset : offset + length]
-            has_more = offset + length < len(content)
-
-            result = {
-                "content": chunk,
-                "hasMore": has_more,
-                "offset": offset,
-                "length": len(chunk),
-                "totalLength": len(content),
-                "metadata": {
-                    "max_chunk_size": max_chunk_bytes,
-                },
-            }
-
-            response = json.dumps(result, indent=2)
+            response = _chunk_response(chunk, has_more, offset, total_length, max_chunk_bytes)
             logger.debug(
-                f"MCP tool response: fetch_content_chunk doc_id={doc_id} "
-                f"offset={offset} length={len(chunk)} hasMore={has_more} totalLength={len(content)}"
+                "MCP tool response: fetch_content_chunk doc_id=%s "
+                "offset=%d length=%d hasMore=%s totalLength=%d",
+                doc_id,
+                offset,
+                len(chunk),
+                has_more,
+                total_length,
             )
             return response
 
@@ -1124,7 +1343,7 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
 
     async def _handle_fetch_content_by_id(self, arguments: dict[str, Any]) -> str:
         """Handle fetch content by ID tool."""
-        logger.debug(f"MCP tool call: fetch_content_by_id args={arguments}")
+        logger.debug("MCP tool call: fetch_content_by_id args=%s", arguments)
         doc_id = arguments.get("docId")
         if not doc_id:
             raise ValueError(
@@ -1136,19 +1355,12 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
             # Use default label if it's not "all"
             label_filter = None if self.default_label == "all" else self.default_label
 
-            # Get full extracted text from Fess index
-            content = await self.fess_client.get_extracted_text_by_doc_id(
-                doc_id, label_filter=label_filter
-            )
-
-            # Store original length before truncation
-            original_length = len(content)
-
-            # Check if content exceeds maxChunkBytes limit
-            from .fess_client import truncate_text_utf8_safe
-
+            # Only the UTF-8 safe prefix within maxChunkBytes is handed back
             max_bytes = self.config.limits.maxChunkBytes
-            truncated_content, was_truncated = truncate_text_utf8_safe(content, max_bytes)
+            prefix = await self.fess_client.get_extracted_text_prefix(
+                doc_id, max_bytes, label_filter=label_filter
+            )
+            truncated_content, was_truncated, original_length = prefix
 
             result = {
                 "content": truncated_content,
@@ -1167,10 +1379,12 @@ Returns the raw image bytes with the appropriate MIME type (image/png or image/j
                     "to retrieve additional sections."
                 )
 
-            response = json.dumps(result, indent=2)
+            response = _compact_dumps(result)
             logger.debug(
-                f"MCP tool response: fetch_content_by_id doc_id={doc_id} "
-                f"totalLength={original_length} truncated={was_truncated}"
+                "MCP tool response: fetch_content_by_id doc_id=%s totalLength=%d truncated=%s",
+                doc_id,
+                original_length,
+                was_truncated,
             )
             return response
 
@@ -0,0 +1,132 @@
+"""Tests for the top-level FastMCP app module."""
+
+import functools
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastmcp import Client, FastMCP
+
+from mcp_fess import app as app_module
+from mcp_fess.config import ServerConfig
+from mcp_fess.fess_client import FessClient
+
+
+@pytest.fixture
+def fess_client():
+    """Install a mocked Fess client and config as the app's server state."""
+    client = MagicMock()
+    client.search = AsyncMock(
+        return_value={"data": [{"doc_id": "doc1", "url": "http://example.com/doc1"}]}
+    )
+    client.fetch_document_content = AsyncMock(return_value=("Document text", "hash"))
+    client.health = AsyncMock(return_value={"status": "green"})
+    client.list_labels = AsyncMock(return_value={"data": [{"value": "hr", "name": "HR"}]})
+    client.batch = functools.partial(FessClient.batch, client)
+
+    app_module._server_state.clear()
+    app_module._server_state["config"] = ServerConfig(fessBaseUrl="http://localhost:8080")
+    app_module._server_state["fess_client"] = client
+    app_module._server_state["jobs"] = {}
+    app_module._doc_cache.clear()
+    yield client
+    app_module._server_state.clear()
+    app_module._doc_cache.clear()
+
+
+@pytest.fixture
+def app(fess_client):
+    """Create a FastMCP app with the module's tools and resources registered."""
+    test_app = FastMCP(name="test")
+    app_module._setup_tools(test_app)
+    app_module._setup_resources(test_app)
+    return test_app
+
+
+@pytest.mark.asyncio
+async def test_lookup_doc_reuses_recent_lookup(fess_client):
+    """Test that a second lookup of the same doc_id does not search again."""
+    first = await app_module._lookup_doc("doc1")
+    second = await app_module._lookup_doc("doc1")
+
+    assert first is second
+    fess_client.search.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_lookup_doc_not_found(fess_client):
+    """Test that a missing document raises and is not cached."""
+    fess_client.search.return_value = {"data": []}
+
+    with pytest.raises(ValueError, match="Document not found: missing"):
+        await app_module._lookup_doc("missing")
+    assert "missing" not in app_module._doc_cache
+
+
+def test_cache_doc_prunes_expired_entries(fess_client):
+    """Test that storing a doc drops entries older than the TTL."""
+    expired_at = time.monotonic() - app_module._DOC_CACHE_TTL_SECONDS - 1
+    app_module._doc_cache["old"] = (expired_at, {"doc_id": "old"})
+
+    app_module._cache_doc("new", {"doc_id": "new"})
+
+    assert list(app_module._doc_cache) == ["new"]
+
+
+def test_cache_doc_evicts_oldest_beyond_cap(fess_client, monkeypatch):
+    """Test that the cache keeps at most _DOC_CACHE_MAX_ENTRIES docs."""
+    monkeypatch.setattr(app_module, "_DOC_CACHE_MAX_ENTRIES", 2)
+
+    for doc_id in ("a", "b", "c"):
+        app_module._cache_doc(doc_id, {"doc_id": doc_id})
+
+    assert list(app_module._doc_cache) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_read_doc_content_passes_doc_id_and_limit(app, fess_client):
+    """Test that the content resource fetches by the looked-up URL with doc_id and cap."""
+    async with Client(app) as client:
+        metadata = await client.read_resource("fess:///doc/doc1")
+        content = await client.read_resource("fess:///doc/doc1/content")
+
+    assert json.loads(metadata[0].text)["doc_id"] == "doc1"
+    assert content[0].text == "Document text"
+    fess_client.search.assert_called_once()
+    config = app_module._server_state["config"]
+    fess_client.fetch_document_content.assert_called_once_with(
+        "http://example.com/doc1",
+        config.contentFetch,
+        doc_id="doc1",
+        max_bytes=config.limits.maxChunkBytes,
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_combines_health_and_labels(app, fess_client):
+    """Test that fess_status reports health and labels together."""
+    async with Client(app) as client:
+        result = await client.call_tool("fess_status", {})
+
+    assert json.loads(result.content[0].text) == {
+        "health": {"status": "green"},
+        "labels": {"data": [{"value": "hr", "name": "HR"}]},
+    }
+    fess_client.health.assert_called_once()
+    fess_client.list_labels.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_status_reports_failed_sub_call(app, fess_client):
+    """Test that a failing sub-call is reported as an error instead of raising."""
+    fess_client.list_labels.side_effect = RuntimeError("labels unavailable")
+
+    async with Client(app) as client:
+        result = await client.call_tool("fess_status", {})
+
+    assert not result.is_error
+    assert json.loads(result.content[0].text) == {
+        "health": {"status": "green"},
+        "labels": {"error": "labels unavailable"},
+    }
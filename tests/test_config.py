@@ -213,3 +213,38 @@ def test_load_config_valid(tmp_path, monkeypatch):
       config = load_config()
       assert config.fessBaseUrl == "http://localhost:8080"
       assert config.domain.name == "Test Domain"
+
+
+def test_load_config_reuses_cached_config(tmp_path, monkeypatch):
+    """Test load_config skips parsing while the file is unchanged."""
+    from mcp_fess import config as config_module
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    config_dir = tmp_path / ".mcp-fess"
+    config_dir.mkdir()
+    config_file = config_dir / "config.json"
+    config_file.write_text(json.dumps({"fessBaseUrl": "http://localhost:8080"}))
+
+    first = load_config()
+    with monkeypatch.context() as m:
+        m.setattr(config_module.orjson, "loads", lambda b: pytest.fail("JSON was parsed"))
+        assert load_config() == first
+    assert not (config_dir / "config.pkl").exists()
+
+    config_file.write_text(json.dumps({"fessBaseUrl": "http://other-host:8080"}))
+    assert load_config().fessBaseUrl == "http://other-host:8080"
+
+
+def test_load_config_returns_independent_copies(tmp_path, monkeypatch):
+    """Test that changes to a loaded config do not leak into later loads."""
+    from mcp_fess.config import LabelDescriptor
+
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    config_dir = tmp_path / ".mcp-fess"
+    config_dir.mkdir()
+    (config_dir / "config.json").write_text(json.dumps({"fessBaseUrl": "http://localhost:8080"}))
+
+    first = load_config()
+    first.labels["all"] = LabelDescriptor(title="All", description="Everything")
+
+    assert "all" not in load_config().labels
@@ -1,9 +1,12 @@
 """Tests for Fess client module."""
 
+import threading
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
+from mcp_fess import fess_client as fess_client_module
 from mcp_fess.config import ContentFetchConfig
 from mcp_fess.fess_client import FessClient, LabelCache
 
@@ -20,11 +23,32 @@ def content_fetch_config():
     return ContentFetchConfig()
 
 
+def test_client_requests_compressed_responses(fess_client):
+    """Test the client advertises gzip, deflate and brotli encodings."""
+    assert fess_client.client.headers["Accept-Encoding"] == "gzip, deflate, br"
+
+
+def test_client_pool_settings_are_configurable():
+    """Test connection pool limits and HTTP/2 can be tuned per client."""
+    client = FessClient(
+        "http://localhost:8080",
+        http2=False,
+        max_connections=8,
+        max_keepalive_connections=4,
+        keepalive_expiry=5.0,
+    )
+    pool = client.client._transport._pool
+    assert pool._max_connections == 8
+    assert pool._max_keepalive_connections == 4
+    assert pool._keepalive_expiry == 5.0
+    assert pool._http2 is False
+
+
 @pytest.mark.asyncio
 async def test_search(fess_client):
     """Test search functionality."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"data": [{"title": "Test"}]}
+    mock_response.content = orjson.dumps({"data": [{"title": "Test"}]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -33,11 +57,39 @@ async def test_search(fess_client):
         assert len(result["data"]) == 1
 
 
+@pytest.mark.asyncio
+async def test_batch_runs_calls_concurrently(fess_client):
+    """Test that batch starts every call before any finishes and keeps call order."""
+    import asyncio
+
+    started = []
+    release = asyncio.Event()
+
+    async def call(name):
+        started.append(name)
+        await release.wait()
+        if name == "bad":
+            raise RuntimeError("boom")
+        return name
+
+    batch = asyncio.create_task(
+        fess_client.batch([lambda: call("a"), lambda: call("bad"), lambda: call("c")])
+    )
+    while len(started) < 3:
+        await asyncio.sleep(0)
+    release.set()
+    results = await batch
+
+    assert results[0] == "a"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == "c"
+
+
 @pytest.mark.asyncio
 async def test_suggest(fess_client):
     """Test suggest functionality."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"suggestions": ["test1", "test2"]}
+    mock_response.content = orjson.dumps({"suggestions": ["test1", "test2"]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -49,7 +101,7 @@ async def test_suggest(fess_client):
 async def test_popular_words(fess_client):
     """Test popular words functionality."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"words": ["word1", "word2"]}
+    mock_response.content = orjson.dumps({"words": ["word1", "word2"]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -61,7 +113,7 @@ async def test_popular_words(fess_client):
 async def test_list_labels(fess_client):
     """Test list labels functionality."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"labels": [{"name": "test"}]}
+    mock_response.content = orjson.dumps({"labels": [{"name": "test"}]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -73,7 +125,7 @@ async def test_list_labels(fess_client):
 async def test_health(fess_client):
     """Test health check functionality."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"status": "green", "timed_out": False}
+    mock_response.content = orjson.dumps({"status": "green", "timed_out": False})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -186,7 +238,7 @@ async def test_search_http_error(fess_client):
 async def test_search_with_all_params(fess_client):
     """Test search with all parameters."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"data": []}
+    mock_response.content = orjson.dumps({"data": []})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(
@@ -205,7 +257,7 @@ async def test_search_with_all_params(fess_client):
         assert "data" in result
         # Verify params were passed
         call_args = mock_get.call_args
-        params = call_args.kwargs["params"]
+        params = dict(call_args.kwargs["params"])
         assert params["q"] == "test"
         assert params["fields.label"] == "label1"
         assert params["start"] == 10
@@ -219,7 +271,7 @@ async def test_search_with_all_params(fess_client):
 async def test_search_minimal_params(fess_client):
     """Test search with minimal parameters."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"data": []}
+    mock_response.content = orjson.dumps({"data": []})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(
@@ -227,7 +279,7 @@ async def test_search_minimal_params(fess_client):
     ) as mock_get:
         await fess_client.search("test")
         call_args = mock_get.call_args
-        params = call_args.kwargs["params"]
+        params = dict(call_args.kwargs["params"])
         assert params["q"] == "test"
         assert params["start"] == 0
         assert params["num"] == 20
@@ -257,7 +309,7 @@ async def test_suggest_http_error(fess_client):
 async def test_suggest_with_all_params(fess_client):
     """Test suggest with all parameters."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"suggestions": []}
+    mock_response.content = orjson.dumps({"suggestions": []})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(
@@ -268,7 +320,7 @@ async def test_suggest_with_all_params(fess_client):
         )
         assert "suggestions" in result
         call_args = mock_get.call_args
-        params = call_args.kwargs["params"]
+        params = dict(call_args.kwargs["params"])
         assert params["q"] == "test"
         assert params["label"] == "label1"
         assert params["num"] == 20
@@ -299,7 +351,7 @@ async def test_popular_words_http_error(fess_client):
 async def test_popular_words_with_all_params(fess_client):
     """Test popular words with all parameters."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"words": []}
+    mock_response.content = orjson.dumps({"words": []})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(
@@ -318,7 +370,7 @@ async def test_popular_words_with_all_params(fess_client):
 async def test_popular_words_no_params(fess_client):
     """Test popular words with no parameters."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"words": []}
+    mock_response.content = orjson.dumps({"words": []})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(
@@ -388,6 +440,27 @@ def test_is_private_network_edge_cases(fess_client):
     assert fess_client._is_private_network("not.an.ip.address") is False
 
 
+def test_is_private_network_ipv6_and_link_local(fess_client):
+    """Test private network detection for IPv6 and link-local addresses."""
+    assert fess_client._is_private_network("fe80::1") is True  # IPv6 link-local
+    assert fess_client._is_private_network("fd00::1") is True  # IPv6 unique local
+    assert fess_client._is_private_network("169.254.1.1") is True  # IPv4 link-local
+    assert fess_client._is_private_network("127.0.0.2") is True  # Whole loopback block
+    assert fess_client._is_private_network("2001:4860:4860::8888") is False
+
+
+def test_is_private_network_caches_host_classification(fess_client):
+    """Test that repeated hosts reuse the cached classification."""
+    fess_client_module._is_private_host.cache_clear()
+
+    assert fess_client._is_private_network("10.1.2.3") is True
+    assert fess_client._is_private_network("10.1.2.3") is True
+
+    info = fess_client_module._is_private_host.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
 # ===========================================================================================
 # OBSOLETE TESTS: The following tests are for the old URL-fetching behavior
 # which has been replaced with index-only content retrieval.
@@ -498,12 +571,61 @@ def test_extract_text_from_html_with_meta_link(fess_client):
 
 
 # Test PDF extraction edge cases
-def test_extract_text_from_pdf_invalid(fess_client):
+@pytest.mark.asyncio
+async def test_extract_text_from_pdf_invalid(fess_client):
     """Test PDF extraction with invalid PDF."""
     invalid_pdf = b"Not a valid PDF"
 
     with pytest.raises(ValueError, match="PDF parsing failed"):
-        fess_client._extract_text_from_pdf(invalid_pdf)
+        await fess_client._extract_text_from_pdf(invalid_pdf)
+
+
+def _make_pdf(page_texts):
+    """Build an in-memory PDF with one page per text."""
+    import pymupdf
+
+    doc = pymupdf.open()
+    for text in page_texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    return doc.tobytes()
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_pdf(fess_client):
+    """Test PDF text extraction for a small PDF."""
+    text = await fess_client._extract_text_from_pdf(_make_pdf(["First page", "Second page"]))
+
+    assert text.index("First page") < text.index("Second page")
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_pdf_runs_off_event_loop(fess_client):
+    """Test that PDFs are parsed on a worker thread, not the event loop."""
+    loop_thread = threading.get_ident()
+    parse_threads = []
+    extract_pdf_texts = fess_client_module._extract_pdf_texts
+
+    def record_thread(content):
+        parse_threads.append(threading.get_ident())
+        return extract_pdf_texts(content)
+
+    with patch("mcp_fess.fess_client._extract_pdf_texts", side_effect=record_thread):
+        text = await fess_client._extract_text_from_pdf(_make_pdf(["Threaded page"]))
+
+    assert "Threaded page" in text
+    assert parse_threads and parse_threads[0] != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_pdf_pages_in_order(fess_client):
+    """Test that PDF extraction keeps the page order."""
+    page_texts = [f"Page number {i}" for i in range(6)]
+
+    text = await fess_client._extract_text_from_pdf(_make_pdf(page_texts))
+
+    positions = [text.index(page_text) for page_text in page_texts]
+    assert positions == sorted(positions)
 
 
 # Label cache tests
@@ -512,7 +634,7 @@ async def test_label_cache_initialization():
     """Test label cache initialization."""
     cache = LabelCache(ttl_seconds=60)
     assert cache.ttl_seconds == 60
-    assert await cache.get() == []
+    assert cache.get() == ()
     assert cache.is_expired() is True
 
 
@@ -522,10 +644,10 @@ async def test_label_cache_set_and_get():
     cache = LabelCache(ttl_seconds=60)
     labels = [{"value": "hr", "name": "HR"}]
 
-    await cache.set(labels)
-    cached = await cache.get()
+    cache.set(labels)
+    cached = cache.get()
 
-    assert cached == labels
+    assert cached == tuple(labels)
     assert cache.is_expired() is False
 
 
@@ -537,7 +659,7 @@ async def test_label_cache_expiration():
     cache = LabelCache(ttl_seconds=1)
     labels = [{"value": "hr", "name": "HR"}]
 
-    await cache.set(labels)
+    cache.set(labels)
     assert cache.is_expired() is False
 
     # Wait for cache to expire
@@ -549,7 +671,7 @@ async def test_label_cache_expiration():
 async def test_get_cached_labels_fresh(fess_client):
     """Test getting fresh cached labels."""
     mock_response = MagicMock()
-    mock_response.json.return_value = {"data": [{"value": "hr", "name": "HR"}]}
+    mock_response.content = orjson.dumps({"data": [{"value": "hr", "name": "HR"}]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
@@ -563,11 +685,11 @@ async def test_get_cached_labels_uses_cache(fess_client):
     """Test that cached labels are used when not expired."""
     # Prepopulate cache
     cached_labels = [{"value": "cached", "name": "Cached"}]
-    await fess_client.label_cache.set(cached_labels)
+    fess_client.label_cache.set(cached_labels)
 
     # This should return cached data without calling Fess
     labels = await fess_client.get_cached_labels()
-    assert labels == cached_labels
+    assert labels == tuple(cached_labels)
 
 
 @pytest.mark.asyncio
@@ -575,7 +697,7 @@ async def test_get_cached_labels_fess_down(fess_client):
     """Test getting cached labels when Fess is down."""
     # Prepopulate cache with stale data
     stale_labels = [{"value": "stale", "name": "Stale"}]
-    await fess_client.label_cache.set(stale_labels)
+    fess_client.label_cache.set(stale_labels)
 
     # Force cache to expire
     fess_client.label_cache._last_fetch = 0
@@ -586,7 +708,7 @@ async def test_get_cached_labels_fess_down(fess_client):
     ):
         labels = await fess_client.get_cached_labels()
         # Should return stale cache
-        assert labels == stale_labels
+        assert labels == tuple(stale_labels)
 
 
 @pytest.mark.asyncio
@@ -594,14 +716,164 @@ async def test_get_cached_labels_force_refresh(fess_client):
     """Test force refresh of cached labels."""
     # Prepopulate cache
     old_labels = [{"value": "old", "name": "Old"}]
-    await fess_client.label_cache.set(old_labels)
+    fess_client.label_cache.set(old_labels)
 
     # Mock fresh data from Fess
     mock_response = MagicMock()
-    mock_response.json.return_value = {"data": [{"value": "new", "name": "New"}]}
+    mock_response.content = orjson.dumps({"data": [{"value": "new", "name": "New"}]})
     mock_response.raise_for_status = MagicMock()
 
     with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
         labels = await fess_client.get_cached_labels(force_refresh=True)
         assert len(labels) == 1
         assert labels[0]["value"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_get_cached_labels_coalesces_concurrent_fetches(fess_client):
+    """Test that concurrent cache misses share a single Fess request."""
+    import asyncio
+
+    mock_response = MagicMock()
+    mock_response.content = orjson.dumps({"data": [{"value": "hr", "name": "HR"}]})
+    mock_response.raise_for_status = MagicMock()
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    mock_get = AsyncMock(side_effect=slow_get)
+    with patch.object(fess_client.client, "get", new=mock_get):
+        results = await asyncio.gather(*(fess_client.get_cached_labels() for _ in range(5)))
+
+    assert mock_get.call_count == 1
+    assert all(labels == ({"value": "hr", "name": "HR"},) for labels in results)
+    assert fess_client.label_cache._inflight is None
+
+
+def test_extract_text_from_html_without_selectolax(fess_client):
+    """Test that HTML extraction falls back to BeautifulSoup."""
+    html = b"<html><body><script>alert('x');</script><p>Fallback content</p></body></html>"
+
+    with patch("mcp_fess.fess_client._HAS_SELECTOLAX", False):
+        text = fess_client._extract_text_from_html(html)
+
+    assert text == "Fallback content"
+
+
+def test_extract_text_from_html_selectolax_error_falls_back(fess_client):
+    """Test that a selectolax parse failure falls back to BeautifulSoup."""
+    html = b"<html><body><p>Fallback content</p></body></html>"
+
+    with patch(
+        "mcp_fess.fess_client.LexborHTMLParser", side_effect=RuntimeError("parse error")
+    ):
+        text = fess_client._extract_text_from_html(html)
+
+    assert text == "Fallback content"
+
+
+def test_extract_text_from_html_strips_noscript(fess_client):
+    """Test that noscript content is dropped by both parsers."""
+    html = b"<html><body><noscript>Enable JavaScript</noscript><p>Body</p></body></html>"
+
+    assert fess_client._extract_text_from_html(html) == "Body"
+    with patch("mcp_fess.fess_client._HAS_SELECTOLAX", False):
+        assert fess_client._extract_text_from_html(html) == "Body"
+
+
+def test_extract_text_from_html_max_bytes(fess_client):
+    """Test that HTML beyond max_bytes is not parsed."""
+    html = b"<p>Kept</p>" + b"<p>Dropped</p>"
+
+    text = fess_client._extract_text_from_html(memoryview(html), max_bytes=11)
+
+    assert text == "Kept"
+
+
+@pytest.mark.asyncio
+async def test_extract_text_from_pdf_rejects_oversize(fess_client):
+    """Test that PDFs larger than max_bytes are rejected before parsing."""
+    with pytest.raises(ValueError, match="exceeds maximum size"):
+        await fess_client._extract_text_from_pdf(b"%PDF-1.4" + b"0" * 100, max_bytes=50)
+
+
+@pytest.mark.asyncio
+async def test_get_cached_labels_serves_stale_while_refreshing(fess_client):
+    """Test that just-expired labels are returned while a background refresh runs."""
+    import time
+
+    fess_client.label_cache.set([{"value": "old", "name": "Old"}])
+    # Expired, but within the stale window
+    fess_client.label_cache._last_fetch = time.time() - fess_client.label_cache.ttl_seconds - 1
+
+    mock_response = MagicMock()
+    mock_response.content = orjson.dumps({"data": [{"value": "new", "name": "New"}]})
+    mock_response.raise_for_status = MagicMock()
+
+    with patch.object(fess_client.client, "get", new=AsyncMock(return_value=mock_response)):
+        labels = await fess_client.get_cached_labels()
+        assert labels == ({"value": "old", "name": "Old"},)
+
+        refresh_task = fess_client._label_refresh_task
+        assert refresh_task is not None
+        await refresh_task
+
+    assert fess_client._label_refresh_task is None
+    assert fess_client.label_cache.get() == ({"value": "new", "name": "New"},)
+    assert fess_client.label_cache.is_expired() is False
+
+
+@pytest.mark.asyncio
+async def test_get_cached_label_values_rebuilt_only_on_refresh(fess_client):
+    """Test that label values are reused until the label cache is replaced."""
+    fess_client.label_cache.set([{"value": "hr", "name": "HR"}, {"name": "No value"}])
+
+    values = await fess_client.get_cached_label_values()
+    assert values == frozenset({"hr"})
+    assert await fess_client.get_cached_label_values() is values
+
+    fess_client.label_cache.set([{"value": "eng", "name": "Engineering"}])
+    assert await fess_client.get_cached_label_values() == frozenset({"eng"})
+
+
+@pytest.mark.asyncio
+async def test_popular_words_uses_response_cache(fess_client):
+    """Test that popular words are cached per parameter set."""
+    mock_response = MagicMock()
+    mock_response.content = orjson.dumps({"data": ["word1"]})
+    mock_response.raise_for_status = MagicMock()
+
+    with patch.object(
+        fess_client.client, "get", new=AsyncMock(return_value=mock_response)
+    ) as mock_get:
+        first = await fess_client.popular_words(label="hr")
+        second = await fess_client.popular_words(label="hr")
+        assert first == second
+        assert mock_get.call_count == 1
+
+        await fess_client.popular_words(label="it")
+        assert mock_get.call_count == 2
+
+        await fess_client.popular_words(label="hr", force_refresh=True)
+        assert mock_get.call_count == 3
+
+
+def test_response_cache_expires_and_evicts():
+    """Test that ResponseCache drops expired entries and the oldest entry when full."""
+    from mcp_fess.fess_client import ResponseCache
+
+    cache = ResponseCache(maxsize=2)
+    key_a = ResponseCache.make_key("a", {})
+    key_b = ResponseCache.make_key("b", {"x": 1})
+    key_c = ResponseCache.make_key("c", {})
+
+    cache.set(key_a, {"a": 1}, ttl_seconds=-1)
+    assert cache.get(key_a) is None
+
+    cache.set(key_a, {"a": 1}, ttl_seconds=60)
+    cache.set(key_b, {"b": 1}, ttl_seconds=60)
+    cache.set(key_c, {"c": 1}, ttl_seconds=60)
+    assert cache.get(key_a) is None
+    assert cache.get(key_b) == {"b": 1}
+    assert cache.get(key_c) == {"c": 1}
@@ -1,12 +1,19 @@
 """Tests for index-only content retrieval from Fess."""
 
+import hashlib
 import json
 from unittest.mock import AsyncMock, patch
 
+import orjson
 import pytest
 
 from mcp_fess.config import ServerConfig
-from mcp_fess.fess_client import FessClient, truncate_text_utf8_safe
+from mcp_fess.fess_client import (
+    DocTextCache,
+    FessClient,
+    content_digest,
+    truncate_text_utf8_safe,
+)
 from mcp_fess.server import FessServer
 
 
@@ -208,6 +215,115 @@ async def test_get_extracted_text_with_label_filter(fess_client):
         )
 
 
+@pytest.mark.asyncio
+async def test_get_extracted_text_is_cached(fess_client):
+    """Test that repeated and concurrent lookups share one search per key."""
+    import asyncio
+
+    doc_id = "test_doc_8b"
+    mock_search_result = {"data": [{"doc_id": doc_id, "content": "Cached content"}]}
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        texts = await asyncio.gather(
+            *(fess_client.get_extracted_text_by_doc_id(doc_id) for _ in range(3))
+        )
+        texts.append(await fess_client.get_extracted_text_by_doc_id(doc_id))
+        assert texts == ["Cached content"] * 4
+        fess_client.search.assert_called_once()
+
+        # A different label filter is a different cache key
+        await fess_client.get_extracted_text_by_doc_id(doc_id, label_filter="hr")
+        assert fess_client.search.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_text_batches_concurrent_lookups(fess_client):
+    """Test that concurrent lookups of different documents share one search."""
+    import asyncio
+
+    mock_search_result = {
+        "data": [
+            {"doc_id": "batch_b", "content": "Content B"},
+            {"doc_id": "batch_a", "content": "Content A"},
+        ]
+    }
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        texts = await asyncio.gather(
+            fess_client.get_extracted_text_by_doc_id("batch_a"),
+            fess_client.get_extracted_text_by_doc_id("batch_b"),
+            fess_client.get_extracted_text_by_doc_id("batch_missing"),
+            return_exceptions=True,
+        )
+
+        fess_client.search.assert_called_once_with(
+            query="doc_id:(batch_a OR batch_b OR batch_missing)",
+            label_filter=None,
+            num=3,
+            start=0,
+        )
+
+    assert texts[0] == "Content A"
+    assert texts[1] == "Content B"
+    assert isinstance(texts[2], ValueError)
+    assert "Document not found" in str(texts[2])
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_text_batch_window_joins_staggered_lookups():
+    """Test that lookups arriving within the batch window share one search."""
+    import asyncio
+
+    client = FessClient("http://localhost:8080", doc_batch_window_ms=50)
+    mock_search_result = {
+        "data": [
+            {"doc_id": "late_a", "content": "Content A"},
+            {"doc_id": "late_b", "content": "Content B"},
+        ]
+    }
+
+    async def staggered_lookup():
+        await asyncio.sleep(0.005)
+        return await client.get_extracted_text_by_doc_id("late_b")
+
+    with patch.object(client, "search", new=AsyncMock(return_value=mock_search_result)):
+        texts = await asyncio.gather(
+            client.get_extracted_text_by_doc_id("late_a"), staggered_lookup()
+        )
+
+        client.search.assert_called_once()
+
+    assert texts == ["Content A", "Content B"]
+    await client.close()
+
+
+def test_doc_text_cache_evicts_least_recently_used():
+    """Test that DocTextCache drops the least recently used entry when full."""
+    cache = DocTextCache(maxsize=2)
+    cache.set(("a", None), "A")
+    cache.set(("b", None), "B")
+    assert cache.get(("a", None)) == "A"
+
+    cache.set(("c", None), "C")
+
+    assert cache.get(("b", None)) is None
+    assert cache.get(("a", None)) == "A"
+    assert cache.get(("c", None)) == "C"
+
+
+def test_doc_text_cache_expires_entries():
+    """Test that DocTextCache entries expire after the TTL."""
+    cache = DocTextCache(ttl_seconds=60)
+    cache.set(("a", None), "A")
+    cache._entries[("a", None)] = (0, "A")
+
+    assert cache.get(("a", None)) is None
+
+
 # Tests for UTF-8 safe truncation
 
 
@@ -263,6 +379,15 @@ def test_truncate_text_utf8_safe_emoji():
     assert len(result) == 12
 
 
+def test_truncate_text_utf8_safe_fast_path_boundaries():
+    """Test the limits of the no-encode shortcuts."""
+    assert truncate_text_utf8_safe("😀" * 25, 100) == ("😀" * 25, False)
+    assert truncate_text_utf8_safe("A" * 100, 100) == ("A" * 100, False)
+    assert truncate_text_utf8_safe("A" * 101, 100) == ("A" * 100, True)
+    # 26 chars may exceed 100 bytes, but these 2-byte ones fit
+    assert truncate_text_utf8_safe("ä" * 26, 100) == ("ä" * 26, False)
+
+
 def test_truncate_text_utf8_safe_empty_string():
     """Test truncation of empty string."""
     text = ""
@@ -315,6 +440,18 @@ async def test_fetch_document_content_index_only(fess_client):
         assert len(content_hash) == 64  # SHA256 hex digest length
 
 
+def test_content_hash_cache_bounded_by_doc_text_cache_size(fess_client):
+    """Test that hashed contents are capped at the doc text cache size."""
+    fess_client.doc_text_cache.maxsize = 2
+
+    for doc_id in ("a", "b", "c"):
+        assert fess_client._get_content_hash(doc_id, f"text {doc_id}") == content_digest(
+            f"text {doc_id}"
+        )
+
+    assert list(fess_client._content_hash_cache) == ["b", "c"]
+
+
 @pytest.mark.asyncio
 async def test_fetch_document_content_file_url_index_only(fess_client):
     """Test that file:// URLs are also handled via index."""
@@ -335,9 +472,157 @@ async def test_fetch_document_content_file_url_index_only(fess_client):
         # Verify no HTTP client was created (no actual file access)
 
 
+@pytest.mark.asyncio
+async def test_fetch_document_content_max_bytes(fess_client):
+    """Test that max_bytes truncates the content but not the hash input."""
+    from mcp_fess.config import ContentFetchConfig
+
+    doc_id = "test_doc_10b"
+    config = ContentFetchConfig(enabled=True)
+    full_content = "\u00e4" * 50  # 100 UTF-8 bytes
+
+    mock_search_result = {"data": [{"doc_id": doc_id, "content": full_content}]}
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        content, content_hash = await fess_client.fetch_document_content(
+            "http://example.com/doc.html", config, doc_id=doc_id, max_bytes=11
+        )
+
+    assert content == "\u00e4" * 5
+    assert content_hash == content_digest(full_content)
+
+
+@pytest.mark.asyncio
+async def test_fetch_document_content_by_id_reuses_hash(fess_client):
+    """Test that unchanged content is not hashed again."""
+    doc_id = "test_doc_10c"
+    mock_search_result = {"data": [{"doc_id": doc_id, "content": "Indexed content"}]}
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ), patch("mcp_fess.fess_client.content_digest", wraps=content_digest) as digest:
+        _, first_hash = await fess_client.fetch_document_content_by_id(doc_id)
+        _, second_hash = await fess_client.fetch_document_content_by_id(doc_id)
+
+    assert first_hash == second_hash == content_digest("Indexed content")
+    assert digest.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_texts_by_doc_ids_uses_one_search(fess_client):
+    """Test that a multi-document lookup is one search and reports missing docs."""
+    mock_search_result = {
+        "data": [
+            {"doc_id": "multi_a", "content": "Content A"},
+            {"doc_id": "multi_b", "body": "Body B"},
+        ]
+    }
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        texts = await fess_client.get_extracted_texts_by_doc_ids(
+            ["multi_a", "multi_b", "multi_a", "multi_missing"]
+        )
+
+        fess_client.search.assert_called_once_with(
+            query="doc_id:(multi_a OR multi_b OR multi_missing)",
+            label_filter=None,
+            num=3,
+            start=0,
+        )
+
+    missing = texts.pop("multi_missing")
+    assert isinstance(missing, ValueError)
+    assert "Document not found" in str(missing)
+    assert texts == {"multi_a": "Content A", "multi_b": "Body B"}
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_text_range_reuses_cached_text(fess_client):
+    """Test that successive ranges of one document need a single search."""
+    mock_search_result = {"data": [{"doc_id": "range_doc", "content": "0123456789"}]}
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        first = await fess_client.get_extracted_text_range("range_doc", 0, 4)
+        last = await fess_client.get_extracted_text_range("range_doc", 8, 4)
+
+        assert fess_client.search.call_count == 1
+
+    assert first == ("0123", 10)
+    assert last == ("89", 10)
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_text_prefix(fess_client):
+    """Test that the prefix is UTF-8 safe and reports the full character length."""
+    mock_search_result = {"data": [{"doc_id": "prefix_doc", "content": "ab" + "あ" * 10}]}
+
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        prefix = await fess_client.get_extracted_text_prefix("prefix_doc", 10)
+
+    assert prefix == ("abああ", True, 12)
+
+
+@pytest.mark.asyncio
+async def test_get_extracted_text_refreshes_ahead_of_expiry(fess_client):
+    """Test that a nearly expired doc text is served and reloaded in the background."""
+    key = ("refresh_doc", None)
+    fess_client.doc_text_cache.set(key, "old text")
+    cached_at, text = fess_client.doc_text_cache._entries[key]
+    fess_client.doc_text_cache._entries[key] = (
+        cached_at - fess_client.doc_text_cache.ttl_seconds * 0.9,
+        text,
+    )
+
+    mock_search_result = {"data": [{"doc_id": "refresh_doc", "content": "new text"}]}
+    with patch.object(
+        fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        assert await fess_client.get_extracted_text_by_doc_id("refresh_doc") == "old text"
+        await fess_client._doc_text_refresh_tasks[key]
+
+    assert fess_client._doc_text_refresh_tasks == {}
+    assert fess_client.doc_text_cache.get(key) == "new text"
+    assert fess_client.doc_text_cache.needs_refresh(key) is False
+
+
+def test_content_digest_matches_whole_text_hash():
+    """Test that slice-wise hashing equals hashing the full UTF-8 encoding."""
+    text = "Größe 文書 " * 20_000
+
+    expected = hashlib.blake2b(text.encode("utf-8"), digest_size=32).hexdigest()
+    assert content_digest(text) == expected
+
+
 # Tests for server handlers
 
 
+@pytest.mark.parametrize("chunk", ["", "plain", 'quote " and \\ backslash', "Größe\n文書 😀"])
+@pytest.mark.parametrize("has_more", [True, False])
+def test_chunk_response_matches_dict_encoding(chunk, has_more):
+    """Test that the templated chunk response equals encoding the result dict."""
+    from mcp_fess.server import _chunk_response
+
+    expected = {
+        "content": chunk,
+        "hasMore": has_more,
+        "offset": 7,
+        "length": len(chunk),
+        "totalLength": 1234,
+        "metadata": {"max_chunk_size": 1048576},
+    }
+    response = _chunk_response(chunk, has_more, 7, 1234, 1048576)
+
+    assert response == orjson.dumps(expected).decode()
+
+
 @pytest.mark.asyncio
 async def test_handle_fetch_content_chunk_index_only(fess_server):
     """Test that fetch_content_chunk uses index-only retrieval."""
@@ -425,6 +710,23 @@ async def test_handle_fetch_content_by_id_utf8_safe_truncation(fess_server):
         assert "fetch_content_chunk" in result["message"]
 
 
+@pytest.mark.asyncio
+async def test_handle_fetch_content_by_id_keeps_utf8_unescaped(fess_server):
+    """Test that non-ASCII content is emitted as UTF-8, not \\u escapes."""
+    doc_id = "test_doc_14b"
+    content = "Größe ändern"
+
+    mock_search_result = {"data": [{"doc_id": doc_id, "content": content}]}
+
+    with patch.object(
+        fess_server.fess_client, "search", new=AsyncMock(return_value=mock_search_result)
+    ):
+        result_json = await fess_server._handle_fetch_content_by_id({"docId": doc_id})
+
+    assert content in result_json
+    assert json.loads(result_json)["content"] == content
+
+
 @pytest.mark.asyncio
 async def test_resource_read_doc_content_index_only(fess_server):
     """Test that the content resource uses index-only retrieval."""
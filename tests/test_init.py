@@ -18,3 +18,16 @@ def test_mcp_instance_exported():
     assert isinstance(mcp_fess.mcp, FastMCP)
     # Verify the name follows the expected pattern (before lifespan initialization)
     assert mcp_fess.mcp.name == "mcp-fess"
+
+
+def test_submodule_import_does_not_load_server():
+    """Test that importing mcp_fess.config does not eagerly import the server stack."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, mcp_fess.config; "
+        "assert 'fastmcp' not in sys.modules; "
+        "assert 'mcp_fess.server' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -62,6 +62,29 @@ class TestElapsedTimeFormatter:
         # Seconds might be 04 or 05 due to timing
         assert seconds in ["04", "05", "06"]
 
+    def test_format_uses_monotonic_clock(self):
+        """Test elapsed time follows the monotonic clock, not wall-clock time."""
+        with patch("mcp_fess.logging_utils.time.monotonic", return_value=1000.0):
+            formatter = ElapsedTimeFormatter(datetime.now())
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="test.py",
+            lineno=1,
+            msg="Test",
+            args=(),
+            exc_info=None,
+        )
+
+        with patch("mcp_fess.logging_utils.time.monotonic", return_value=1061.5):
+            formatter.format(record)
+        assert record.elapsed_time == "00:01:01"
+
+        with patch("mcp_fess.logging_utils.time.monotonic", return_value=4662.0):
+            formatter.format(record)
+        assert record.elapsed_time == "01:01:02"
+
 
 class TestSetupLogging:
     """Test setup_logging function."""
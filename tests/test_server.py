@@ -202,6 +202,94 @@ async def test_handle_list_labels_success(fess_server):
         assert "defaultLabel" in result
 
 
+@pytest.mark.asyncio
+async def test_handle_list_labels_configured_rows(fess_server):
+    """Test configured label rows, including one added after startup."""
+    from mcp_fess.config import LabelDescriptor
+
+    fess_server.config.labels["hr"] = LabelDescriptor(
+        title="HR", description="HR docs", examples=["leave policy"]
+    )
+    mock_labels = [{"value": "hr", "name": "HR Department"}]
+
+    with patch.object(
+        fess_server.fess_client, "get_cached_labels", new=AsyncMock(return_value=mock_labels)
+    ):
+        result = json.loads(await fess_server._handle_list_labels())
+
+    rows = {row["value"]: row for row in result["labels"]}
+    assert list(rows["hr"]) == [
+        "value",
+        "name",
+        "title",
+        "description",
+        "examples",
+        "isConfigured",
+        "isPresentInFess",
+    ]
+    assert rows["hr"]["name"] == "HR Department"
+    assert rows["hr"]["examples"] == ["leave policy"]
+    assert rows["hr"]["isPresentInFess"] is True
+    assert rows["all"]["name"] == ""
+    assert rows["all"]["isPresentInFess"] is True
+
+
+@pytest.mark.asyncio
+async def test_handle_list_labels_reuses_response_until_labels_change(fess_server):
+    """Test that list_labels is rebuilt only when Fess returns new labels."""
+    fess_server.config.strictLabels = False
+    mock_get_labels = AsyncMock(return_value=({"value": "hr", "name": "HR"},))
+
+    with patch.object(fess_server.fess_client, "get_cached_labels", new=mock_get_labels):
+        first = await fess_server._handle_list_labels()
+        assert await fess_server._handle_list_labels() is first
+
+        mock_get_labels.return_value = ({"value": "eng", "name": "Engineering"},)
+        refreshed = await fess_server._handle_list_labels()
+
+    assert "hr" not in refreshed
+    assert "Engineering" in refreshed
+
+
+@pytest.mark.asyncio
+async def test_handle_list_labels_picks_up_label_added_to_config(fess_server):
+    """Test that a label added to the config after a call shows up in the next one."""
+    from mcp_fess.config import LabelDescriptor
+
+    mock_labels = [{"value": "hr", "name": "HR Department"}]
+
+    with patch.object(
+        fess_server.fess_client, "get_cached_labels", new=AsyncMock(return_value=mock_labels)
+    ):
+        first = json.loads(await fess_server._handle_list_labels())
+        assert [row["value"] for row in first["labels"]] == ["all"]
+
+        fess_server.config.labels["hr"] = LabelDescriptor(
+            title="HR", description="HR docs", examples=[]
+        )
+        second = json.loads(await fess_server._handle_list_labels())
+
+    assert [row["value"] for row in second["labels"]] == ["all", "hr"]
+
+
+@pytest.mark.asyncio
+async def test_handle_list_labels_picks_up_replaced_descriptor(fess_server):
+    """Test that replacing a configured label's descriptor changes its row."""
+    from mcp_fess.config import LabelDescriptor
+
+    fess_server.config.labels["all"] = LabelDescriptor(
+        title="Everything", description="Whole index", examples=["handbook"]
+    )
+
+    with patch.object(fess_server.fess_client, "get_cached_labels", new=AsyncMock(return_value=[])):
+        result = json.loads(await fess_server._handle_list_labels())
+
+    row = result["labels"][0]
+    assert row["title"] == "Everything"
+    assert row["description"] == "Whole index"
+    assert row["examples"] == ["handbook"]
+
+
 @pytest.mark.asyncio
 async def test_handle_list_labels_with_fess_down(fess_server):
     """Test list labels when Fess is down."""
@@ -227,6 +315,26 @@ async def test_handle_health_success(fess_server):
         assert "green" in result
 
 
+@pytest.mark.asyncio
+async def test_handle_health_compact_unless_debug(fess_server):
+    """Test that health responses are compact JSON, indented only at debug level."""
+    import logging
+
+    mock_result = {"status": "green", "timed_out": False}
+    logger = logging.getLogger("mcp_fess")
+    previous_level = logger.level
+
+    with patch.object(fess_server.fess_client, "health", new=AsyncMock(return_value=mock_result)):
+        try:
+            logger.setLevel(logging.INFO)
+            assert await fess_server._handle_health() == '{"status":"green","timed_out":false}'
+
+            logger.setLevel(logging.DEBUG)
+            assert "\n" in await fess_server._handle_health()
+        finally:
+            logger.setLevel(previous_level)
+
+
 @pytest.mark.asyncio
 async def test_handle_job_get_missing_job_id(fess_server):
     """Test job get handler with missing job ID."""
@@ -242,6 +350,14 @@ async def test_handle_job_get_not_found(fess_server):
     assert "Job not found" in result
 
 
+@pytest.mark.asyncio
+async def test_handle_job_get_not_found_escapes_job_id(fess_server):
+    """Test that the not-found response stays valid JSON for any job ID."""
+    job_id = 'bad"id\\'
+    result = json.loads(await fess_server._handle_job_get({"jobId": job_id}))
+    assert result == {"error": "Job not found", "jobId": job_id}
+
+
 @pytest.mark.asyncio
 async def test_handle_job_get_success(fess_server):
     """Test successful job get."""
@@ -870,6 +986,102 @@ async def test_handle_search_snippets_true_attaches_mcp_snippets(fess_server):
         assert "source_field" in doc["mcp_snippets"]
 
 
+@pytest.mark.asyncio
+async def test_handle_search_snippets_generated_off_event_loop(fess_server):
+    """Test that snippet generation runs on a worker thread, not the event loop."""
+    import threading
+
+    from mcp_fess import server as server_module
+
+    loop_thread = threading.get_ident()
+    snippet_threads = []
+    generate_snippets = server_module._generate_snippets
+
+    def record_thread(**kwargs):
+        snippet_threads.append(threading.get_ident())
+        return generate_snippets(**kwargs)
+
+    mock_result = {"data": [{"doc_id": "abc123", "title": "Test"}]}
+    with (
+        patch.object(fess_server.fess_client, "search", new=AsyncMock(return_value=mock_result)),
+        patch.object(
+            fess_server.fess_client,
+            "get_extracted_text_by_doc_id",
+            new=AsyncMock(return_value="The quick brown fox"),
+        ),
+        patch("mcp_fess.server._generate_snippets", side_effect=record_thread),
+    ):
+        result = await fess_server._handle_search({"query": "fox", "snippets": True})
+
+    assert json.loads(result)["data"][0]["mcp_snippets"]["snippets"]
+    assert snippet_threads and snippet_threads[0] != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_handle_search_snippets_bounded_by_max_in_flight(fess_server):
+    """Test that per-hit snippet work never exceeds maxInFlightRequests at once."""
+    import threading
+    import time
+
+    from mcp_fess import server as server_module
+
+    fess_server.config.limits.maxInFlightRequests = 2
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    generate_snippets = server_module._generate_snippets
+
+    def slow_generate(**kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return generate_snippets(**kwargs)
+
+    mock_result = {"data": [{"doc_id": f"doc{i}", "title": "Test"} for i in range(5)]}
+    texts = {f"doc{i}": f"fox in doc{i}" for i in range(5)}
+    with (
+        patch.object(fess_server.fess_client, "search", new=AsyncMock(return_value=mock_result)),
+        patch.object(
+            fess_server.fess_client,
+            "get_extracted_texts_by_doc_ids",
+            new=AsyncMock(return_value=texts),
+        ),
+        patch("mcp_fess.server._generate_snippets", side_effect=slow_generate),
+    ):
+        result = await fess_server._handle_search({"query": "fox", "snippets": True})
+
+    assert peak == 2
+    assert all(doc["mcp_snippets"]["snippets"] for doc in json.loads(result)["data"])
+
+
+@pytest.mark.asyncio
+async def test_handle_search_snippets_failed_lookup_not_refetched(fess_server):
+    """Test that a doc whose batched lookup failed is reported without a second request."""
+    mock_result = {"data": [{"doc_id": "good", "title": "Ok"}, {"doc_id": "gone", "title": "X"}]}
+
+    async def lookup(doc_id, label_filter=None):
+        if doc_id == "gone":
+            raise ValueError("Document not found for doc_id=gone")
+        return "The quick brown fox"
+
+    with (
+        patch.object(fess_server.fess_client, "search", new=AsyncMock(return_value=mock_result)),
+        patch.object(
+            fess_server.fess_client, "get_extracted_text_by_doc_id", side_effect=lookup
+        ) as mock_lookup,
+    ):
+        result = await fess_server._handle_search({"query": "fox", "snippets": True})
+
+    assert mock_lookup.call_count == 2
+    good, gone = json.loads(result)["data"]
+    assert good["mcp_snippets"]["snippets"]
+    assert gone["mcp_snippets"] == {"error": "Document not found for doc_id=gone"}
+
+
 @pytest.mark.asyncio
 async def test_handle_search_snippets_highlight_applied(fess_server):
     """Test that snippet text contains the highlight markup."""
@@ -1,5 +1,6 @@
 """Tests for client-side snippet generation helpers."""
 
+from unittest.mock import patch
 
 from mcp_fess.server import _apply_highlight, _extract_query_terms, _generate_snippets
 
@@ -30,6 +31,11 @@ def test_extract_query_terms_strips_punctuation():
     assert "test" in terms
 
 
+def test_extract_query_terms_keeps_inner_punctuation():
+    terms = _extract_query_terms("(version 1.2) don't")
+    assert terms == ["version", "1.2", "dont"]
+
+
 def test_extract_query_terms_drops_single_chars():
     terms = _extract_query_terms("a big test")
     assert "a" not in terms
@@ -87,6 +93,11 @@ def test_apply_highlight_longer_term_takes_priority():
     assert result.count("<em>") == 1
 
 
+def test_apply_highlight_single_term_repeated_matches():
+    result = _apply_highlight("Foo food foo", ["foo"], "<b>", "</b>")
+    assert result == "<b>Foo</b> <b>foo</b>d <b>foo</b>"
+
+
 def test_apply_highlight_no_double_tagging():
     result = _apply_highlight("test test", ["test"], "<em>", "</em>")
     assert result == "<em>test</em> <em>test</em>"
@@ -177,3 +188,18 @@ def test_generate_snippets_multiple_terms():
     snippets = _generate_snippets(text, ["fox", "dog"], 20, 3, "<em>", "</em>", 1000)
     combined = " ".join(snippets)
     assert "<em>fox</em>" in combined or "<em>dog</em>" in combined
+
+
+def test_generate_snippets_without_ahocorasick_matches_same_terms():
+    text = "The quick brown fox. The lazy dog sleeps."
+    with patch("mcp_fess.server._HAS_AHOCORASICK", False):
+        fallback = _generate_snippets(text, ["fox", "dog"], 20, 3, "<em>", "</em>", 1000)
+    snippets = _generate_snippets(text, ["fox", "dog"], 20, 3, "<em>", "</em>", 1000)
+    assert snippets == fallback
+
+
+def test_generate_snippets_overlapping_terms_found_once():
+    text = "prefix " + "A" * 50 + " foxes " + "B" * 50
+    snippets = _generate_snippets(text, ["fox", "foxes"], 20, 2, "<em>", "</em>", 1000)
+    assert len(snippets) == 1
+    assert "<em>foxes</em>" in snippets[0]